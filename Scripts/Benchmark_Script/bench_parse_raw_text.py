@@ -0,0 +1,51 @@
+import os
+import re
+import sys
+import time
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(os.path.join(SCRIPTS_DIR, "Output_Script"))
+import Allen_Output as output
+
+raw_text_file = os.path.join(SCRIPTS_DIR, "..", "Final_Result", "Raw_Text_Result.txt")
+
+
+# ------------------------------
+# The old way: one fresh DOTALL search per keyword, from the start of the text
+# ------------------------------
+def legacy_sections(raw_text):
+    blocks = {}
+    for keyword in ("Payment History:", "Tax History:", "Due Dates:"):
+        match = re.search(rf"{re.escape(keyword)}\s*(.*)", raw_text, re.DOTALL)
+        blocks[keyword] = match.group(1).strip() if match else ""
+    return blocks
+
+
+def tokenizer_sections(raw_text):
+    sections = output.tokenize_sections(raw_text)
+    return {name: output.section_text(raw_text, sections, name) for name in sections}
+
+
+def bench(label, func, records, rounds):
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for record in records:
+            func(record)
+    elapsed = time.perf_counter() - started
+    per_record_us = elapsed / (rounds * len(records)) * 1e6
+    print(f"{label:<28} {per_record_us:8.1f} us/record")
+    return per_record_us
+
+
+# ------------------------------
+# Run
+# ------------------------------
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    records = list(output.iter_raw_records(raw_text_file))
+    print(f"{len(records)} records from {os.path.normpath(raw_text_file)}, {rounds} rounds\n")
+
+    legacy = bench("section search (legacy)", legacy_sections, records, rounds)
+    single = bench("tokenize_sections", tokenizer_sections, records, rounds)
+    bench("parse_raw_text", output.parse_raw_text, records, rounds)
+    print(f"\nsection extraction speed-up: {legacy / single:.2f}x")
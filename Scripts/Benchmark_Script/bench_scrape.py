@@ -0,0 +1,152 @@
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from lowtaxinfo_stub import start_stub_server
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+# Step logs the scrapers leave in a record when something did not load
+FAILURE_RE = re.compile(r"Step [\d-]+ failed|did not load|No matching record|Error in record|Unexpected error")
+
+
+# ------------------------------
+# Environment: every URL and on-disk cache points at the stub / a temp dir
+# ------------------------------
+def prepare_environment(base_url, work_dir, keep_index=False):
+    """Must run before the scrapers are imported, they read these at import time."""
+    os.environ["COUNTY_SITE_URL"] = f"{base_url}/allencounty"
+    os.environ["DUE_DATES_URL"] = f"{base_url}/due-dates"
+    os.environ["STEP_TRACE_FILE"] = os.path.join(work_dir, "step_trace.jsonl")
+    os.environ["DUE_DATES_CACHE"] = os.path.join(work_dir, "due_dates_cache.json")
+    if not keep_index:
+        # A warm index skips Steps 1-6, so cold runs are the default
+        os.environ["DUPLICATE_INDEX"] = os.path.join(work_dir, "duplicate_index.sqlite3")
+
+
+# ------------------------------
+# Targets
+# ------------------------------
+def bench_production(parcels):
+    sys.path.append(os.path.join(SCRIPTS_DIR, "Production_Script"))
+    import IN_AllenCounty_Production as production
+
+    outputs = []
+    try:
+        for parcel in parcels:
+            outputs.append(production.scrape_data("address", parcel["address"], parcel["owner"]))
+    finally:
+        production.driver_pool.close()
+    return outputs
+
+
+def bench_batch(parcels, work_dir, workers, max_uses, fetch_mode, browser_profile):
+    sys.path.append(os.path.join(SCRIPTS_DIR, "Raw_Text_Script"))
+    import Allen_Raw_Text as raw_text
+    import Allen_Raw_Text_Batch as batch
+    from common.checkpoint import CheckpointJournal
+    from common.raw_text_sink import RawTextSink
+
+    # Keep the benchmark's output away from the real raw text file
+    raw_text.output_file = os.path.join(work_dir, "bench.rawtext.txt")
+    raw_text.raw_text_sink = RawTextSink(raw_text.output_file)
+    raw_text.checkpoint_journal = CheckpointJournal(raw_text.output_file + ".journal")
+    raw_text.use_browser_profile(browser_profile)
+
+    batch.run_batch(
+        [parcel["address"] for parcel in parcels],
+        [parcel["owner"] for parcel in parcels],
+        workers, max_uses, fetch_mode,
+    )
+    with open(raw_text.output_file, "r", encoding="utf-8") as f:
+        return [record for record in f.read().split(raw_text.RECORD_SEPARATOR) if record.strip()]
+
+
+def count_failures(outputs):
+    return sum(1 for output in outputs if output is None or FAILURE_RE.search(output))
+
+
+# ------------------------------
+# Run
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scrapers against the local lowtaxinfo stand-in.")
+    parser.add_argument("--target", choices=["production", "batch"], default="production")
+    parser.add_argument("--records", type=int, default=0, help="records to scrape, cycling the parcels (0 = each parcel once)")
+    parser.add_argument("--pages", type=int, default=1, help="result pages per search (the match is on the last)")
+    parser.add_argument("--rows-per-page", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--workers", type=int, default=4, help="batch target only")
+    parser.add_argument("--max-uses", type=int, default=200, help="batch target only")
+    parser.add_argument("--fetch-mode", choices=["selenium", "http"], default="selenium")
+    parser.add_argument("--browser-profile", choices=["default", "lean"], default="default",
+                        help="the production target can only block requests, so lean is recorded there as block-only")
+    parser.add_argument("--detail-extract", choices=["elements", "script"], default="elements", help="how Chrome reads the detail sections")
+    parser.add_argument("--page-weight", action="store_true", help="record requests and bytes per page in the step trace")
+    parser.add_argument("--keep-index", action="store_true", help="use the real Duplicate# index instead of a cold one")
+    parser.add_argument("--label", default="", help="free text stored with the result, e.g. the change being measured")
+    parser.add_argument("--results", default="bench_scrape_results.jsonl", help="one JSON line is appended per run")
+    args = parser.parse_args()
+
+    server, config, base_url = start_stub_server(
+        pages=args.pages, rows_per_page=args.rows_per_page, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms
+    )
+    work_dir = tempfile.mkdtemp(prefix="bench_scrape_")
+    prepare_environment(base_url, work_dir, args.keep_index)
+    os.environ["DETAIL_FETCH_MODE"] = args.fetch_mode
+    os.environ["BROWSER_PROFILE"] = args.browser_profile
+    os.environ["DETAIL_EXTRACT"] = args.detail_extract
+    os.environ["TRACK_PAGE_WEIGHT"] = "1" if args.page_weight else "0"
+
+    sys.path.append(SCRIPTS_DIR)
+    from common.tracing import step_tracer
+
+    count = args.records or len(config.parcels)
+    parcels = [config.parcels[n % len(config.parcels)] for n in range(count)]
+    print(f"Stub at {base_url}: {len(config.parcels)} parcels, {args.pages} page(s), {args.latency_ms} ms latency")
+
+    started = time.perf_counter()
+    try:
+        if args.target == "production":
+            outputs = bench_production(parcels)
+        else:
+            outputs = bench_batch(parcels, work_dir, args.workers, args.max_uses, args.fetch_mode, args.browser_profile)
+    finally:
+        seconds = time.perf_counter() - started
+        server.shutdown()
+
+    per_minute = len(outputs) / seconds * 60 if seconds else 0.0
+    failures = count_failures(outputs)
+    # The profile the scraper really ran with, e.g. block-only for lean on the production target
+    browser_profile = step_tracer.tags.get("browser_profile", args.browser_profile)
+    print(f"\n{args.target} ({browser_profile}): {len(outputs)} records in {seconds:.1f}s ({per_minute:.1f} records/min), {failures} with errors")
+    print(f"Stub requests: {config.requests}")
+    step_tracer.print_summary()
+
+    result = {
+        "label": args.label,
+        "target": args.target,
+        "fetch_mode": args.fetch_mode,
+        "browser_profile": browser_profile,
+        "detail_extract": args.detail_extract,
+        "records": len(outputs),
+        "failures": failures,
+        "seconds": round(seconds, 3),
+        "records_per_min": round(per_minute, 1),
+        "stub_requests": config.requests,
+        "pages": args.pages,
+        "rows_per_page": args.rows_per_page,
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "workers": args.workers if args.target == "batch" else 1,
+        "steps": step_tracer.summary(),
+        "finished_at": round(time.time(), 3),
+    }
+    with open(args.results, "a", encoding="utf-8") as f:
+        f.write(json.dumps(result) + "\n")
+    print(f"Result appended to {args.results}")
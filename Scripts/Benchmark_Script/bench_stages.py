@@ -0,0 +1,269 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # not on Windows; peak RSS is reported as None there
+    resource = None
+
+from make_raw_text import write_raw_text
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(SCRIPTS_DIR)
+sys.path.append(os.path.join(SCRIPTS_DIR, "Output_Script"))
+sys.path.append(os.path.join(SCRIPTS_DIR, "Dataset_Script"))
+
+STAGES = ("parse", "output-text", "output-jsonl", "dataset-legacy", "dataset-stream")
+DEFAULT_SCALES = (10_000, 100_000, 1_000_000)
+
+
+# ------------------------------
+# Files of one scale in the work dir
+# ------------------------------
+def stage_paths(work_dir, count, seed):
+    prefix = os.path.join(work_dir, f"{count}_s{seed}")
+    return {
+        "raw": f"{prefix}.rawtext.txt",
+        "output_text": f"{prefix}.output.txt",
+        "output_jsonl": f"{prefix}.output.jsonl",
+        "dataset_jsonl": f"{prefix}.dataset.jsonl",
+    }
+
+
+class Digest:
+    """Order-sensitive sha256 over serialized records, plus their count."""
+
+    def __init__(self):
+        self._sha = hashlib.sha256()
+        self.count = 0
+
+    def add(self, line):
+        self._sha.update(line.encode("utf-8") + b"\n")
+        self.count += 1
+
+    def result(self):
+        return {"records": self.count, "digest": self._sha.hexdigest()}
+
+
+def compact(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+# ------------------------------
+# Stages (each runs in its own child process)
+# ------------------------------
+def run_stage(stage, paths, workers, chunksize):
+    """Run one stage against the files in paths; returns what the parent needs to check it."""
+    import Allen_Output as output
+    import Allen_Dataset as dataset
+    from common.raw_records import iter_raw_records
+
+    output.input_file = paths["raw"]
+    dataset.raw_text_file = paths["raw"]
+    dataset.output_txt_file = paths["output_text"]
+
+    if stage == "parse":
+        digest = Digest()
+        for record in iter_raw_records(paths["raw"]):
+            digest.add(output.render_output(output.parse_raw_text(record), "jsonl"))
+        return digest.result()
+
+    if stage == "output-text":
+        output.process_multiple_records(workers, chunksize, "text", paths["output_text"])
+        return {}
+
+    if stage == "output-jsonl":
+        output.process_multiple_records(workers, chunksize, "jsonl", paths["output_jsonl"])
+        return {}
+
+    if stage == "dataset-legacy":
+        unmatched = {"raw": [], "output": []}
+        dataset.unmatched_json_file = os.devnull
+        rows = dataset.build_dataset(unmatched)
+        digest = Digest()
+        for row in rows:
+            digest.add(json.dumps(row, ensure_ascii=False))
+        return dict(digest.result(), unmatched_raw=len(unmatched["raw"]), unmatched_output=len(unmatched["output"]))
+
+    if stage == "dataset-stream":
+        unmatched = {"raw": [], "output": []}
+        rows = dataset.iter_dataset(dataset.iter_raw_texts(paths["raw"]), dataset.iter_output_records_jsonl(paths["output_jsonl"]), unmatched)
+        dataset.save_dataset_jsonl(rows, paths["dataset_jsonl"])
+        return {"unmatched_raw": len(unmatched["raw"]), "unmatched_output": len(unmatched["output"])}
+
+    raise ValueError(f"Unknown stage: {stage}")
+
+
+def peak_rss_mb(who):
+    if resource is None:
+        return None
+    kb = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is in KB on Linux and in bytes on macOS
+    return round(kb / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def child_main(stage, paths, workers, chunksize):
+    started = time.perf_counter()
+    # The scripts print a line per record; keep that out of the measurement's output
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        result = run_stage(stage, paths, workers, chunksize)
+    seconds = time.perf_counter() - started
+    result.update(
+        seconds=round(seconds, 3),
+        peak_rss_mb=peak_rss_mb(resource.RUSAGE_SELF) if resource else None,
+        peak_worker_rss_mb=peak_rss_mb(resource.RUSAGE_CHILDREN) if resource else None,
+    )
+    print(json.dumps(result))
+
+
+def run_child(stage, paths, workers, chunksize, timeout):
+    command = [sys.executable, os.path.abspath(__file__), "--child", stage, "--paths", json.dumps(paths),
+               "--workers", str(workers), "--chunksize", str(chunksize)]
+    try:
+        done = subprocess.run(command, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "seconds": timeout}
+    if done.returncode != 0:
+        # A MemoryError shows in stderr; the OOM killer shows as returncode -9
+        return {"status": "crashed", "returncode": done.returncode, "error": done.stderr.strip().splitlines()[-1:]}
+    result = json.loads(done.stdout.strip().splitlines()[-1])
+    result["status"] = "ok"
+    return result
+
+
+# ------------------------------
+# Equivalence checks, streamed in the parent
+# ------------------------------
+def digest_lines(path):
+    digest = Digest()
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                digest.add(line.rstrip("\n"))
+    return digest.result()
+
+
+def digest_text_output(path):
+    """The text output's '--- Record N ---' blocks, re-serialized like the JSONL lines."""
+    digest = Digest()
+    block = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.startswith("--- Record "):
+                block = []
+            elif line.startswith("-" * 20) and block is not None:
+                digest.add(compact(json.loads("".join(block))))
+                block = None
+            elif block is not None:
+                block.append(line)
+    return digest.result()
+
+
+def check_equivalence(stage, result, reference, paths):
+    """Compare a stage's records with the reference: parse_raw_text for Output, the streaming join for Dataset."""
+    if stage == "output-text":
+        result.update(digest_text_output(paths["output_text"]))
+    elif stage == "output-jsonl":
+        result.update(digest_lines(paths["output_jsonl"]))
+    elif stage == "dataset-stream":
+        result.update(digest_lines(paths["dataset_jsonl"]))
+
+    expected = reference.get("dataset" if stage.startswith("dataset") else "parse")
+    if stage in ("parse", "dataset-stream"):
+        result["equivalent"] = None  # these are the references
+    elif expected is None:
+        result["equivalent"] = None
+    else:
+        result["equivalent"] = result.get("digest") == expected
+    return result
+
+
+# ------------------------------
+# One scale
+# ------------------------------
+def bench_scale(count, args):
+    paths = stage_paths(args.work_dir, count, args.seed)
+    if not os.path.exists(paths["raw"]):
+        started = time.perf_counter()
+        write_raw_text(paths["raw"], count, args.seed)
+        print(f"Generated {count} records in {time.perf_counter() - started:.1f}s")
+    print(f"\n{count} records ({os.path.getsize(paths['raw']) / 1e6:.0f} MB raw text)")
+
+    # The dataset reference is built from the JSONL output, so run it before the legacy stage
+    order = sorted(args.stages, key=lambda stage: ("parse", "output-text", "output-jsonl", "dataset-stream", "dataset-legacy").index(stage))
+    reference = {}
+    results = {}
+    for stage in order:
+        needs = {"dataset-legacy": "output-text", "dataset-stream": "output-jsonl"}.get(stage)
+        if needs and results.get(needs, {}).get("status") not in (None, "ok"):
+            results[stage] = {"status": "skipped", "reason": f"{needs} failed"}
+            continue
+
+        result = run_child(stage, paths, args.workers, args.chunksize, args.timeout)
+        if result["status"] == "ok":
+            check_equivalence(stage, result, reference, paths)
+            if stage == "parse":
+                reference["parse"] = result["digest"]
+            elif stage == "dataset-stream":
+                reference["dataset"] = result["digest"]
+            result["records_per_sec"] = round(result.get("records", 0) / result["seconds"], 1) if result["seconds"] else None
+        results[stage] = result
+        print_result(stage, result)
+    return results
+
+
+def print_result(stage, result):
+    if result["status"] != "ok":
+        print(f"  {stage:<15} {result['status'].upper()} {result.get('error') or result.get('reason') or ''}")
+        return
+    unmatched = ""
+    if "unmatched_raw" in result:
+        unmatched = f" unmatched raw/output={result['unmatched_raw']}/{result['unmatched_output']}"
+    print(
+        f"  {stage:<15} {result.get('records', 0):>9} records {result['seconds']:>9.1f}s "
+        f"{result['records_per_sec'] or 0:>10.1f} rec/s  peak RSS {result['peak_rss_mb']} MB "
+        f"(workers {result['peak_worker_rss_mb']} MB)  equivalent={result['equivalent']}{unmatched}"
+    )
+
+
+# ------------------------------
+# Run
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Throughput, peak RSS and output equivalence of the Output and Dataset stages at scale.")
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES), help="record counts to generate and run")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="workers for process_multiple_records")
+    parser.add_argument("--chunksize", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds before a stage counts as fallen over")
+    parser.add_argument("--work-dir", default="bench_data", help="generated inputs are kept here and reused")
+    parser.add_argument("--label", default="", help="free text stored with the result, e.g. the change being measured")
+    parser.add_argument("--results", default="bench_stages_results.jsonl", help="one JSON line is appended per scale")
+    parser.add_argument("--child", choices=STAGES, help=argparse.SUPPRESS)
+    parser.add_argument("--paths", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child_main(args.child, json.loads(args.paths), args.workers, args.chunksize)
+        sys.exit(0)
+
+    os.makedirs(args.work_dir, exist_ok=True)
+    for count in args.scales:
+        results = bench_scale(count, args)
+        with open(args.results, "a", encoding="utf-8") as f:
+            f.write(json.dumps({
+                "label": args.label,
+                "records": count,
+                "seed": args.seed,
+                "workers": args.workers,
+                "stages": results,
+                "finished_at": round(time.time(), 3),
+            }) + "\n")
+    print(f"\nResults appended to {args.results}")
@@ -0,0 +1,218 @@
+import argparse
+import html
+import os
+import random
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(SCRIPTS_DIR)
+sys.path.append(os.path.join(SCRIPTS_DIR, "Output_Script"))
+import Allen_Output as output
+
+raw_text_file = os.path.join(SCRIPTS_DIR, "..", "Final_Result", "Raw_Text_Result.txt")
+
+SEARCH_ADDRESS_RE = re.compile(r"^\d+\. Search Address: (.+)$", re.MULTILINE)
+DUPLICATE_RE = re.compile(r"Duplicate Number\s*\n\s*(\d+)")
+DETAIL_PATH_RE = re.compile(r"^/[^/]+/(\d+)-(\d{4})/?$")
+
+# Detail page element id -> section name in the raw text
+DETAIL_SECTIONS = (
+    ("info", "Property Information"),
+    ("billing-detail", "Tax Information"),
+    ("payment-history", "Payment History"),
+    ("tax-history", "Tax History"),
+)
+
+
+# ------------------------------
+# Parcels from the saved raw text
+# ------------------------------
+def load_parcels(path=None):
+    """
+    One parcel per 'N. Search Address:' record: address, a synthetic owner (the
+    raw text does not carry one), Duplicate#, and the text of each section.
+    """
+    with open(path or raw_text_file, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    headers = list(SEARCH_ADDRESS_RE.finditer(content))
+    parcels = []
+    for n, header in enumerate(headers):
+        end = headers[n + 1].start() if n + 1 < len(headers) else len(content)
+        raw = content[header.end():end]
+        duplicate = DUPLICATE_RE.search(raw)
+        if not duplicate:
+            continue
+        sections = output.tokenize_sections(raw)
+        parcels.append({
+            "address": header.group(1).strip(),
+            "owner": f"Bench Owner{n + 1} A",
+            "duplicate": duplicate.group(1),
+            "sections": {name: output.section_text(raw, sections, name) for name in sections},
+        })
+    return parcels
+
+
+def normalize_string(s):
+    return re.sub(r'[^a-zA-Z0-9]', '', s).lower()
+
+
+def lines_html(text):
+    """One <div> per line; leading spaces become &nbsp; so indentation survives like on the live page."""
+    divs = []
+    for line in text.splitlines():
+        if line.strip():
+            indent = len(line) - len(line.lstrip(" "))
+            divs.append(f"<div>{'&nbsp;' * indent}{html.escape(line[indent:])}</div>")
+    return "".join(divs)
+
+
+# ------------------------------
+# Page builders
+# ------------------------------
+SEARCH_FORM = """
+<form method="get">
+  <input id="owner-name" name="owner" type="text">
+  <input id="address" name="address" type="text">
+</form>
+"""
+
+
+def search_page(parcel_rows, page, pages):
+    body = [SEARCH_FORM]
+    if parcel_rows is not None:
+        rows = "".join(
+            f"<tr><td>{html.escape(owner)}</td><td>{html.escape(address)}</td><td>Duplicate# {duplicate}</td></tr>"
+            for owner, address, duplicate in parcel_rows
+        )
+        body.append(f'<table class="table table-sm table-hover"><tbody>{rows}</tbody></table>')
+        if pages > 1:
+            links = "".join(f'<li class="page-item"><a class="page-link" href="?page={n}">{n}</a></li>' for n in range(1, pages + 1))
+            body.append(f'<ul class="pagination">{links}</ul>')
+    return "<html><body>" + "".join(body) + "</body></html>"
+
+
+def detail_page(parcel):
+    sections = "".join(
+        f'<div id="{element_id}">{lines_html(parcel["sections"].get(name, ""))}</div>'
+        for element_id, name in DETAIL_SECTIONS
+    )
+    return f'<html><body><div id="parcel">{sections}</div></body></html>'
+
+
+def due_dates_page(text):
+    items = "".join(f"<li>{html.escape(line)}</li>" for line in text.splitlines() if line.strip())
+    return f"<html><body><ul><li>Property taxes</li></ul><ul>{items}</ul></body></html>"
+
+
+# ------------------------------
+# Server
+# ------------------------------
+class StubConfig:
+    def __init__(self, parcels, pages=1, rows_per_page=10, latency_ms=0, jitter_ms=0):
+        self.parcels = parcels
+        self.pages = pages
+        self.rows_per_page = rows_per_page
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.by_duplicate = {parcel["duplicate"]: parcel for parcel in parcels}
+        self.due_dates = next((p["sections"].get("Due Dates") for p in parcels if p["sections"].get("Due Dates")), "")
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def results(self, address, page):
+        """Rows for one page of a search: filler parcels, with the real match on the last page."""
+        wanted = normalize_string(address)
+        matches = [p for p in self.parcels if wanted and wanted in normalize_string(p["address"])]
+        rows = []
+        for n in range(self.rows_per_page):
+            if page == self.pages and n == self.rows_per_page - 1:
+                rows.extend((p["owner"], p["address"], p["duplicate"]) for p in matches)
+            else:
+                rows.append((f"Filler Owner{page}{n}", f"{page}{n} Filler Rd", f"9{page:03d}{n:03d}"))
+        return rows
+
+    def pause(self):
+        with self._lock:
+            self.requests += 1
+        delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000.0)
+
+
+def make_handler(config):
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            config.pause()
+            url = urlsplit(self.path)
+            query = parse_qs(url.query)
+
+            if url.path.rstrip("/") == "/due-dates":
+                return self.send_page(due_dates_page(config.due_dates))
+
+            detail = DETAIL_PATH_RE.match(url.path)
+            if detail:
+                parcel = config.by_duplicate.get(detail.group(1))
+                if parcel is None:
+                    return self.send_page("<html><body>Not found</body></html>", status=404)
+                return self.send_page(detail_page(parcel))
+
+            address = query.get("address", [""])[0]
+            page = int(query.get("page", ["1"])[0])
+            rows = config.results(address, page) if address else None
+            return self.send_page(search_page(rows, page, config.pages))
+
+        def send_page(self, body, status=200):
+            data = body.encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(host="127.0.0.1", port=0, **config_kwargs):
+    """Serve in a background thread; returns (server, config, base_url)."""
+    config = StubConfig(load_parcels(config_kwargs.pop("raw_text_path", None)), **config_kwargs)
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, config, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for lowtaxinfo.com and the indy.gov due dates page.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--pages", type=int, default=1, help="result pages per search (the match is on the last)")
+    parser.add_argument("--rows-per-page", type=int, default=10)
+    parser.add_argument("--latency-ms", type=float, default=0, help="delay added to every response")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="extra random delay, up to this much")
+    parser.add_argument("--raw-text", default=raw_text_file, help="raw text file the parcels are built from")
+    args = parser.parse_args()
+
+    server, config, base_url = start_stub_server(
+        port=args.port,
+        raw_text_path=args.raw_text,
+        pages=args.pages,
+        rows_per_page=args.rows_per_page,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+    )
+    print(f"Serving {len(config.parcels)} parcels")
+    print(f"  COUNTY_SITE_URL={base_url}/allencounty")
+    print(f"  DUE_DATES_URL={base_url}/due-dates")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
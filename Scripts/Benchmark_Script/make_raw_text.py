@@ -0,0 +1,176 @@
+import argparse
+import random
+
+RECORD_SEPARATOR = "=" * 90
+HEADER_RULE = "-" * 80
+FILE_BANNER = "///----------------------> For Multiple Records in One script <-------------------------///\n\n"
+
+# Spring / fall due dates by pay year, as indy.gov lists them
+DUE_DATES = {
+    2023: ("May 10, 2023", "November 13, 2023"),
+    2024: ("May 10, 2024", "November 12, 2024"),
+    2025: ("May 12, 2025", "November 10, 2025"),
+}
+
+STREETS = ("Osprey Pass", "W North County Line Rd", "Thimlar Rd", "Maplecrest Rd", "Coldwater Rd", "Lima Rd", "Dupont Rd", "Tonkel Rd")
+TOWNS = (("Huntertown", "46748", "58 - Huntertown"), ("Churubusco", "46723", "44 - Eel River"),
+         ("New Haven", "46774", "91 - New Haven"), ("Fort Wayne", "46825", "91 - Fort Wayne"))
+SURNAMES = ("Smith", "Miller", "Yoder", "Schwartz", "Nguyen", "Garcia", "Johnson", "Graber")
+GIVEN_NAMES = ("Karen K", "John A", "Mary L", "Jacob", "Linda S", "David R")
+PROPERTY_CLASSES = (
+    "RESIDENTIAL ONE FAMILY DWELLING ON A PLATTED LOT",
+    "RESIDENTIAL ONE FAMILY DWELLING ON UNPLATTED LAND OF 0-9.99 ACRES",
+    "VACANT PLATTED LOT",
+    "AGRICULTURAL - CASH GRAIN/GENERAL FARM",
+)
+TAX_INFO_LINES = (
+    "Spring Tax", "Spring Penalty", "Spring Annual", "Fall Tax", "Fall Penalty", "Fall Annual",
+    "Delq NTS Tax", "Delq NTS Pen", "Delq TS Tax", "Delq TS Pen", "Other Assess",
+    "Late Fine", "Late Penalty", "Demand Fee", "Jdg Tax/Pen/Int", "Judgement Fee", "Advert Fee",
+    "Tax Sale Fee", "NSF Fee", "Certified to Court", "PTRC", "HMST Credit", "Circuit Breaker Credit",
+    "Over 65 CB Credit",
+)
+
+
+def money(cents):
+    return f"${cents // 100:,}.{cents % 100:02d}"
+
+
+# ------------------------------
+# Owner names: single, joint and trust owners
+# ------------------------------
+def owner_name(rng):
+    first = f"{rng.choice(SURNAMES)} {rng.choice(GIVEN_NAMES)}"
+    kind = rng.random()
+    if kind < 0.6:
+        return first
+    if kind < 0.85:
+        return f"{first} & {rng.choice(SURNAMES)} {rng.choice(GIVEN_NAMES)}"
+    return f"{first} Revocable Trust, {rng.choice(SURNAMES)} {rng.choice(GIVEN_NAMES)} Trustee"
+
+
+# ------------------------------
+# One synthetic record
+# ------------------------------
+def make_record(idx, seed=0):
+    """
+    One raw text record in the layout the Raw Text script writes: header, the four
+    detail sections and the due dates. Layouts vary by record: pay year, one-line
+    or two-line current Tax History row, paid / part-paid / unpaid, delinquencies.
+    """
+    rng = random.Random(seed * 1_000_003 + idx)
+    pay_year = rng.choice((2023, 2024, 2025, 2025, 2025))
+    street, (town, zip_code, tax_unit) = rng.choice(STREETS), rng.choice(TOWNS)
+    address = f"{rng.randint(100, 19999)} {street} {town}, IN {zip_code}"
+    parcel = f"02-{idx // 1_000_000 % 100:02d}-{idx // 10_000 % 100:02d}-{idx // 100 % 100:03d}-{idx % 100:03d}.000-{rng.randint(40, 99):03d}"
+    owners = owner_name(rng)
+
+    # Current pay year: installments, delinquency carried in and what was paid
+    installment = rng.randint(5_000, 400_000)
+    spring, fall = installment + rng.choice((0, 0, 1_000, 1_500)), installment
+    delinquency = rng.choice((0, 0, 0, rng.randint(1_000, 300_000)))
+    total = spring + fall + delinquency
+    paid_state = rng.choice(("paid", "paid", "spring", "none"))
+    payments = total if paid_state == "paid" else spring if paid_state == "spring" else 0
+
+    lines = [
+        "",
+        HEADER_RULE,
+        f"{idx}. Search Address: {address}",
+        HEADER_RULE,
+        " ",
+        " ",
+        "Property Information:",
+        "Property Information",
+        "Tax Year/Pay Year",
+        f"{pay_year - 1} / {pay_year}",
+        "Parcel Number",
+        parcel,
+        "Duplicate Number",
+        str(100_000 + idx),
+        "Property Type",
+        "Real",
+        "Tax Unit / Description",
+        tax_unit,
+        "Property Class",
+        rng.choice(PROPERTY_CLASSES),
+        "Mortgage Company",
+        rng.choice(("None", "Lereta LLC", "Corelogic Tax Services")),
+        "TIF",
+        "None",
+        "Homestead Credit Filed?",
+        rng.choice(("Yes", "No")),
+        "Over 65 Circuit Breaker?",
+        rng.choice(("Yes", "No")),
+        "Legal Description",
+        "Note: Not to be used on legal documents",
+        f"Lot {rng.randint(1, 200)} {street} Sec {rng.randint(1, 4)} ({owners})",
+        "Section-Township-Range",
+        "No Info",
+        "Parcel Acres",
+        rng.choice(("No Info", str(rng.randint(1, 80)))),
+        "Lot Number",
+        "No Info",
+        "Block/Subdivision",
+        "No info",
+        " ",
+        "Tax Information:",
+        "Tax Bill Adjustments Balance",
+    ]
+    balances = {"Spring Tax": spring, "Fall Tax": fall, "Delq NTS Tax": delinquency}
+    lines += [f"{label}: {money(balances.get(label, 0))} $0.00 {money(balances.get(label, 0))}" for label in TAX_INFO_LINES]
+    lines += [
+        f"Tax and Penalty: {money(total)}",
+        f"Subtotal: {money(total)}",
+        f"    Receipts: {money(payments)}",
+        f"Total Due: {money(total - payments)}",
+        f"Account Balance: {money(total - payments)}",
+        " ",
+        "Payment History:",
+        "Payable Year Entry Date Payable Period Amount Paid Notes Property Project",
+    ]
+    if payments:
+        lines.append(f"{pay_year} 05/0{rng.randint(1, 9)}/{pay_year} S {money(spring + delinquency)} Lock Box Payment N")
+        if paid_state == "paid":
+            lines.append(f"{pay_year} 10/2{rng.randint(0, 9)}/{pay_year} F {money(fall)} Lock Box Payment N")
+    lines += [" ", "Tax History:", "Pay Year Spring Fall Delinquencies Total Tax Payments"]
+
+    # The current row is split over two lines on most records, like the live site
+    current = f"{money(spring)} {money(fall)} {money(delinquency)} {money(total)} {money(payments)}"
+    if rng.random() < 0.8:
+        lines += [str(pay_year), current]
+    else:
+        lines.append(f"{pay_year} {current}")
+
+    amount = installment
+    for year in range(pay_year - 1, pay_year - 1 - rng.randint(0, 12), -1):
+        amount = max(1_000, amount - rng.randint(0, amount // 10 + 1))
+        prior_delinquency = rng.choice((0, 0, 0, 0, 0, 0, rng.randint(500, amount)))
+        prior_total = amount * 2 + prior_delinquency
+        lines.append(f"{year} {money(amount)} {money(amount)} {money(prior_delinquency)} {money(prior_total)} {money(prior_total)}")
+
+    lines += [" ", "Due Dates:", *DUE_DATES[pay_year], " ", RECORD_SEPARATOR, ""]
+    return "\n".join(lines) + "\n"
+
+
+def write_raw_text(path, count, seed=0):
+    """Write count records to path, one at a time, so even 1M records never sit in memory."""
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(FILE_BANNER)
+        for idx in range(1, count + 1):
+            f.write(make_record(idx, seed))
+    return path
+
+
+# ------------------------------
+# Run
+# ------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic raw text file in the Raw Text script's layout.")
+    parser.add_argument("count", type=int, help="number of records, e.g. 10000, 100000 or 1000000")
+    parser.add_argument("output", help="raw text file to write")
+    parser.add_argument("--seed", type=int, default=0, help="same seed and count give the same file")
+    args = parser.parse_args()
+
+    write_raw_text(args.output, args.count, args.seed)
+    print(f"Wrote {args.count} records to {args.output}")
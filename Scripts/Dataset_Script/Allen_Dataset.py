@@ -1,5 +1,12 @@
+import argparse
 import json
+import os
 import re
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.manifest import Manifest, content_hash, manifest_path, merge_jsonl
+from common.raw_records import dataset_input_text, iter_raw_records, output_parcel_number, parcel_number
 
 
 # ------------------------------------------------------
@@ -8,6 +15,9 @@ import re
 raw_text_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Raw_Text\Owen_Raw_Text.txt"
 output_txt_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Output\Owen_Output.txt"
 dataset_json_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Json\Owen.json"
+output_jsonl_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Output\Owen_Output.jsonl"
+dataset_jsonl_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Json\Owen.jsonl"
+unmatched_json_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Json\Owen_unmatched.json"
 
 
 # ------------------------------------------------------
@@ -21,19 +31,13 @@ def clean(text: str) -> str:
 # ------------------------------------------------------
 # 1️⃣ Extract raw text records
 # ------------------------------------------------------
-def extract_raw_texts():
-    with open(raw_text_file, "r", encoding="utf-8") as f:
-        content = f.read()
-
-
-    # Split by start and end markers
-    pattern = re.compile(
-        r"Property Information:(.*?)(?:Due Dates:\s*May 12, 2025\s*November 10, 2025)",
-        re.DOTALL
-    )
-    raw_records = pattern.findall(content)
-    print(f"Found {len(raw_records)} raw text records.")
-    return raw_records
+def iter_raw_texts(path=None):
+    """
+    One record's dataset input at a time: the text after 'Property Information:'
+    up to 'Due Dates:', whatever the pay year or due dates are.
+    """
+    for record in iter_raw_records(path or raw_text_file):
+        yield dataset_input_text(record)
 
 
 # ------------------------------------------------------
@@ -65,50 +69,115 @@ def extract_output_records():
     return parsed_outputs
 
 
+def iter_output_records_jsonl(path=None):
+    """Output records from the JSONL output file, one line at a time; no regex recovery needed."""
+    with open(path or output_jsonl_file, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"JSON parsing error on line {line_number}: {e}")
+
+
 # ------------------------------------------------------
 # 3️⃣ Combine raw text + output into dataset
 # ------------------------------------------------------
-def build_dataset():
-    raw_records = extract_raw_texts()
+def build_dataset_row(raw, output):
+    """One dataset entry: cleaned raw text in, output JSON with taxYear moved after delinquentNotes."""
+    # Rebuild "output" structure by inserting taxYear after "delinquentNotes"
+    if "parcels" in output and isinstance(output["parcels"], list):
+        for parcel in output["parcels"]:
+            # Move taxYear key after delinquentNotes
+            if "taxYear" in parcel:
+                # Temporarily store and remove
+                ty = parcel.pop("taxYear")
+                # Build new ordered dict-like structure
+                new_parcel = {}
+                for key, value in parcel.items():
+                    new_parcel[key] = value
+                    if key == "delinquentNotes":
+                        new_parcel["taxYear"] = ty
+                parcel.clear()
+                parcel.update(new_parcel)
+
+
+    return {
+        "instruction": "",
+        "input": clean(raw),
+        "output": output
+    }
+
+
+# ------------------------------------------------------
+# Join raw text and output by parcel number
+# ------------------------------------------------------
+def index_output_records(output_records, unmatched):
+    """One pass over the output side: {parcel number: output}. Keyless and repeated records go to unmatched."""
+    index = {}
+    for position, output in enumerate(output_records, 1):
+        key = output_parcel_number(output)
+        if not key:
+            unmatched["output"].append({"position": position, "reason": "no parcel number"})
+        elif key in index:
+            unmatched["output"].append({"position": position, "parcelNumber": key, "reason": "duplicate parcel number"})
+        else:
+            index[key] = output
+    return index
+
+
+def join_records(raw_records, output_records, unmatched=None):
+    """
+    Yield (raw, output) pairs matched on parcel number, whatever order either
+    side is in. Anything left over is recorded in unmatched = {"raw": [...], "output": [...]}.
+    """
+    if unmatched is None:
+        unmatched = {"raw": [], "output": []}
+    index = index_output_records(output_records, unmatched)
+
+    for position, raw in enumerate(raw_records, 1):
+        key = parcel_number(raw)
+        output = index.pop(key, None) if key else None
+        if output is None:
+            unmatched["raw"].append({"position": position, "parcelNumber": key, "reason": "no output record" if key else "no parcel number"})
+            continue
+        yield raw, output
+
+    for key in index:
+        unmatched["output"].append({"parcelNumber": key, "reason": "no raw text record"})
+
+
+def iter_dataset(raw_records, output_records, unmatched=None):
+    """Join raw and output records by parcel number and yield dataset entries as they are built."""
+    for raw, output in join_records(raw_records, output_records, unmatched):
+        yield build_dataset_row(raw, output)
+
+
+def report_unmatched(unmatched, path=None):
+    """Print how many records could not be paired and keep the details next to the dataset."""
+    if not unmatched["raw"] and not unmatched["output"]:
+        return
+    path = path or unmatched_json_file
+    print(f"Unmatched: {len(unmatched['raw'])} raw text records, {len(unmatched['output'])} output records.")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(unmatched, f, indent=2, ensure_ascii=False)
+    print(f"Unmatched records saved to: {path}")
+
+
+def build_dataset(unmatched=None):
+    raw_records = iter_raw_texts(raw_text_file)
     output_records = extract_output_records()
 
 
-    dataset = []
-    for i, (raw, output) in enumerate(zip(raw_records, output_records), start=1):
-        # Extract taxYear value from output JSON
-        tax_year = ""
-        try:
-            tax_year = output["parcels"][0].get("taxYear", "")
-        except (KeyError, IndexError, TypeError):
-            pass
-
-
-        # Rebuild "output" structure by inserting taxYear after "delinquentNotes"
-        if "parcels" in output and isinstance(output["parcels"], list):
-            for parcel in output["parcels"]:
-                # Move taxYear key after delinquentNotes
-                if "taxYear" in parcel:
-                    # Temporarily store and remove
-                    ty = parcel.pop("taxYear")
-                    # Build new ordered dict-like structure
-                    new_parcel = {}
-                    for key, value in parcel.items():
-                        new_parcel[key] = value
-                        if key == "delinquentNotes":
-                            new_parcel["taxYear"] = ty
-                    parcel.clear()
-                    parcel.update(new_parcel)
-
-
-        record = {
-            "instruction": "",
-            "input": clean(raw),
-            "output": output
-        }
-        dataset.append(record)
+    if unmatched is None:
+        unmatched = {"raw": [], "output": []}
+    dataset = list(iter_dataset(raw_records, output_records, unmatched))
 
 
     print(f"Created dataset with {len(dataset)} records.")
+    report_unmatched(unmatched)
     return dataset
 
 
@@ -121,9 +190,82 @@ def save_dataset(dataset):
     print(f"Dataset saved to: {dataset_json_file}")
 
 
+def save_dataset_jsonl(dataset, path=None):
+    """Write one dataset entry per line as they arrive, so memory stays flat."""
+    path = path or dataset_jsonl_file
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in dataset:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    print(f"Dataset saved to: {path} ({count} records)")
+
+
+# ------------------------------------------------------
+# 5️⃣ Incremental rebuild of the JSONL dataset
+# ------------------------------------------------------
+def update_dataset_jsonl(raw_records, output_records, path=None):
+    """
+    Rebuild only the rows whose raw text or output changed since the last run
+    (per the manifest) and merge them into the existing JSONL dataset by parcel number.
+    """
+    path = path or dataset_jsonl_file
+    manifest = Manifest(manifest_path(path), target_path=path)
+    unmatched = {"raw": [], "output": []}
+    updates = {}
+    digests = {}
+    skipped = 0
+
+    for raw, output in join_records(raw_records, output_records, unmatched):
+        key = output_parcel_number(output)
+        digest = content_hash(raw, json.dumps(output, sort_keys=True))
+        if manifest.unchanged(key, digest):
+            skipped += 1
+            continue
+        updates[key] = json.dumps(build_dataset_row(raw, output), ensure_ascii=False)
+        digests[key] = digest
+
+    replaced, appended = merge_jsonl(path, updates, lambda row: output_parcel_number(row.get("output")))
+    for key, digest in digests.items():
+        manifest.update(key, digest)
+    manifest.save()
+
+    print(f"Dataset updated: {replaced} changed, {appended} new, {skipped} unchanged.")
+    print(f"Dataset saved to: {path}")
+    report_unmatched(unmatched)
+
+
 # ------------------------------------------------------
 # Run
 # ------------------------------------------------------
 if __name__ == "__main__":
-    dataset = build_dataset()
-    save_dataset(dataset)
+    parser = argparse.ArgumentParser(description="Pair raw text records with their output JSON.")
+    parser.add_argument("--input-format", choices=("text", "jsonl"), default="text", help="format of the Output script's file")
+    parser.add_argument("--format", choices=("json", "jsonl"), default="json", help="dataset file format")
+    parser.add_argument("--incremental", action="store_true", help="only rebuild changed rows and merge them into the JSONL dataset")
+    args = parser.parse_args()
+
+    if args.incremental:
+        if args.format != "jsonl":
+            parser.error("--incremental needs --format jsonl")
+        if args.input_format == "jsonl":
+            output_records = iter_output_records_jsonl()
+        else:
+            output_records = extract_output_records()
+        update_dataset_jsonl(iter_raw_texts(), output_records)
+    elif args.input_format == "text" and args.format == "json":
+        dataset = build_dataset()
+        save_dataset(dataset)
+    else:
+        # Streaming path: raw and output records are read and written one at a time
+        if args.input_format == "jsonl":
+            output_records = iter_output_records_jsonl()
+        else:
+            output_records = extract_output_records()
+        unmatched = {"raw": [], "output": []}
+        dataset = iter_dataset(iter_raw_texts(), output_records, unmatched)
+        if args.format == "jsonl":
+            save_dataset_jsonl(dataset)
+        else:
+            save_dataset(list(dataset))
+        report_unmatched(unmatched)
@@ -1,23 +1,81 @@
+import argparse
+import functools
+import itertools
 import json
+import multiprocessing
+import os
 import re
+import sys
 from datetime import datetime, timedelta
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.money import amounts_array, format_cents, split_installments
+from common.tax_history import TaxHistoryTable
+from common.parse_cache import ParseCache
+from common.manifest import Manifest, content_hash, manifest_path, merge_jsonl
+from common.raw_records import iter_raw_records, output_parcel_number, parcel_number
+
 
 # ------------------------------
 # File paths
 # ------------------------------
 input_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Raw_Text\Owen_Raw_Text.txt"
 output_txt_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Output\Owen_Output.txt"
+output_jsonl_file = r"C:\Users\RamyaSandhiveeran\Documents\PYTHON_SELENIUM\DataSet\IN_DataSet\IN_Output\Owen_Output.jsonl"
+
+OUTPUT_FORMATS = ("text", "jsonl")
+
+parse_cache_file = os.getenv("PARSE_CACHE", "parse_cache.sqlite3")
+
+# Bump whenever parse_raw_text's output changes; cached parses and manifest entries of older versions are dropped
+PARSER_VERSION = "2"
 
 
 # ------------------------------
-# Helper functions
+# Precompiled patterns
 # ------------------------------
-def extract_after(text, keyword):
-    pattern = rf"{re.escape(keyword)}\s*(.*)"
-    match = re.search(pattern, text, re.DOTALL)
-    return match.group(1).strip() if match else ""
+YEAR_RE = re.compile(r"(\d{4})")
+DATE_RE = re.compile(r"[A-Za-z]+\s+\d{1,2},\s+\d{4}")
+
 
+# ------------------------------
+# Section tokenizer
+# ------------------------------
+SECTION_HEADERS = ("Property Information:", "Tax Information:", "Payment History:", "Tax History:", "Due Dates:")
+
+
+def tokenize_sections(raw_text):
+    """
+    Walk the raw text once and return {section name: (start, end)}, where start is
+    just after the section's header and end is where the next section begins.
+    Sections are always written in SECTION_HEADERS order, so each header is looked
+    for from where the previous one was found; a missing section is simply skipped.
+    """
+    found = []
+    cursor = 0
+    for header in SECTION_HEADERS:
+        pos = raw_text.find(header, cursor)
+        if pos != -1:
+            cursor = pos + len(header)
+            found.append((header[:-1], pos, cursor))
+
+    sections = {}
+    for i, (name, _, start) in enumerate(found):
+        end = found[i + 1][1] if i + 1 < len(found) else len(raw_text)
+        sections[name] = (start, end)
+    return sections
+
+
+def section_text(raw_text, sections, name):
+    if name not in sections:
+        return ""
+    start, end = sections[name]
+    return raw_text[start:end].strip()
+
+
+# ------------------------------
+# Helper functions
+# ------------------------------
 
 def format_date(date_str):
     try:
@@ -36,87 +94,102 @@ def next_day(date_str):
 
 
 def extract_parcel_number(text):
-    match = re.search(r"Parcel Number\s*\n([^\n]+)", text)
-    return match.group(1).strip() if match else ""
+    return parcel_number(text)
+
+
+def tax_history_amounts(raw_text):
+    """All Tax History amounts of one record as a NumPy array of cents, for batch aggregation."""
+    sections = tokenize_sections(raw_text)
+    return amounts_array(section_text(raw_text, sections, "Tax History"))
 
 
 # ------------------------------
-# Main parser for one record
+# Tax History rows for a batch of records
 # ------------------------------
-def parse_raw_text(raw_text):
-    parcel_number = extract_parcel_number(raw_text)
-    payment_history_block = extract_after(raw_text, "Payment History:")
-    tax_year_match = re.search(r"(\d{4})", payment_history_block)
-    tax_year = tax_year_match.group(1) if tax_year_match else ""
+NO_TAX_HISTORY = (0, 0, 0, 0, 0)
 
 
-    # Tax History Extraction
-    tax_history_block = extract_after(raw_text, "Tax History:")
-    tax_lines = [line.strip() for line in tax_history_block.splitlines() if line.strip()]
+def tax_history_rows(table, record_id):
+    """(current row, prior-year delinquencies) of one record in a TaxHistoryTable."""
+    return table.current_rows().get(record_id, NO_TAX_HISTORY), table.delinquencies().get(record_id, [])
+
 
+def batch_tax_history_rows(raw_texts):
+    """
+    tax_history_rows for every record of a batch from one table: the current-row and
+    delinquency selections run once over all rows instead of once per record.
+    """
+    table = TaxHistoryTable()
+    for record_id, raw_text in enumerate(raw_texts):
+        table.add_record(record_id, section_text(raw_text, tokenize_sections(raw_text), "Tax History"))
+    current, delinquent = table.current_rows(), table.delinquencies()
+    return [(current.get(record_id, NO_TAX_HISTORY), delinquent.get(record_id, [])) for record_id in range(len(raw_texts))]
 
-    current_year_data = ""
-    for idx, line in enumerate(tax_lines):
-        if re.match(r"^\d{4}$", line.strip()):
-            if idx + 1 < len(tax_lines):
-                current_year_data = tax_lines[idx + 1].strip()
-            break
 
+# ------------------------------
+# Main parser for one record
+# ------------------------------
+def parse_raw_text(raw_text, tax_rows=None):
+    """tax_rows comes from batch_tax_history_rows; without it the record gets a table of its own."""
+    sections = tokenize_sections(raw_text)
+    parcel_number = extract_parcel_number(raw_text)
 
-    # Extract amounts
-    values = re.findall(r"\$[\d,\.]+", current_year_data)
-    spring_val, fall_val, delinquency_val, total_tax_val, payments_val = values if len(values) >= 5 else ["$0.00"] * 5
+    # Tax year: first 4-digit number from the Payment History header onwards
+    tax_year = ""
+    if "Payment History" in sections:
+        tax_year_match = YEAR_RE.search(raw_text, sections["Payment History"][0])
+        tax_year = tax_year_match.group(1) if tax_year_match else ""
 
 
-    spring_float = float(spring_val.replace("$", "").replace(",", ""))
-    fall_float = float(fall_val.replace("$", "").replace(",", ""))
-    delinquency_float = float(delinquency_val.replace("$", "").replace(",", ""))
-    total_tax_float = float(total_tax_val.replace("$", "").replace(",", ""))
-    payments_float = float(payments_val.replace("$", "").replace(",", ""))
+    # Tax History Extraction
+    # Columnar Tax History: row 0 is the current pay year, later rows are prior years
+    if tax_rows is None:
+        tax_history_block = section_text(raw_text, sections, "Tax History")
+        tax_rows = tax_history_rows(TaxHistoryTable().add_record(0, tax_history_block), 0)
+    current_row, prior_delinquencies = tax_rows
+    spring_cents, fall_cents, delinquency_cents, total_tax_cents, payments_cents = current_row
 
 
-    installment_amount1 = round(total_tax_float / 2, 2)
-    installment_amount2 = round(total_tax_float / 2, 2)
+    installment_amount1, installment_amount2 = split_installments(total_tax_cents)
 
 
-    paid1 = paid2 = unpaid1 = unpaid2 = 0.0
+    paid1 = paid2 = unpaid1 = unpaid2 = 0
 
 
     # ------------------------------
     # PAYMENT LOGIC
     # ------------------------------
-    if payments_float == total_tax_float and delinquency_float == 0.0:
+    if payments_cents == total_tax_cents and delinquency_cents == 0:
         paid1 = installment_amount1
         paid2 = installment_amount2
-    elif payments_float < total_tax_float and delinquency_float == 0.0:
+    elif payments_cents < total_tax_cents and delinquency_cents == 0:
         paid1 = installment_amount1
         unpaid2 = installment_amount2 - paid2
-    elif payments_float < total_tax_float and delinquency_float > 0.0:
-        paid1 = spring_float
-        paid2 = fall_float
+    elif payments_cents < total_tax_cents and delinquency_cents > 0:
+        paid1 = spring_cents
+        paid2 = fall_cents
         unpaid1 = max(0, installment_amount1 - paid1)
         unpaid2 = max(0, installment_amount2 - paid2)
-    elif payments_float == total_tax_float and delinquency_float > 0.0:
-        paid1 = spring_float
-        paid2 = fall_float
+    elif payments_cents == total_tax_cents and delinquency_cents > 0:
+        paid1 = spring_cents
+        paid2 = fall_cents
         unpaid1 = max(0, installment_amount1 - paid1)
         unpaid2 = max(0, installment_amount2 - paid2)
 
 
-    fmt = lambda val: f"${val:,.2f}"
-    installment_amount1_str = fmt(installment_amount1)
-    installment_amount2_str = fmt(installment_amount2)
-    paid1_str = fmt(paid1)
-    paid2_str = fmt(paid2)
-    unpaid1_str = fmt(unpaid1)
-    unpaid2_str = fmt(unpaid2)
+    installment_amount1_str = format_cents(installment_amount1)
+    installment_amount2_str = format_cents(installment_amount2)
+    paid1_str = format_cents(paid1)
+    paid2_str = format_cents(paid2)
+    unpaid1_str = format_cents(unpaid1)
+    unpaid2_str = format_cents(unpaid2)
 
 
     # ------------------------------
     # Due Dates
     # ------------------------------
-    due_dates_block = extract_after(raw_text, "Due Dates:")
-    due_dates = re.findall(r"[A-Za-z]+\s+\d{1,2},\s+\d{4}", due_dates_block)
+    due_dates_block = section_text(raw_text, sections, "Due Dates")
+    due_dates = DATE_RE.findall(due_dates_block)
     due1 = format_date(due_dates[0]) if len(due_dates) > 0 else ""
     due2 = format_date(due_dates[1]) if len(due_dates) > 1 else ""
     delinquent1 = next_day(due1)
@@ -126,35 +199,10 @@ def parse_raw_text(raw_text):
     # ------------------------------
     # Delinquencies
     # ------------------------------
-    delinquencies = []
-    lines = [line.strip() for line in tax_history_block.strip().splitlines() if line.strip()]
-    lines = lines[2:]  # skip headers
-
-
-    i = 0
-    while i < len(lines):
-        line = lines[i]
-        match_same_line = re.match(r"(\d{4})\s+(\$[\d,\.]+)\s+(\$[\d,\.]+)\s+(\$[\d,\.]+)", line)
-        if match_same_line:
-            year, spring, fall, delinquent_amt = match_same_line.groups()
-            delinquent_float = float(delinquent_amt.replace("$", "").replace(",", ""))
-            if delinquent_float > 0:
-                delinquencies.append({"payoffAmount": f"${delinquent_float:,.2f}", "taxYear": year})
-            i += 1
-            continue
-        match_year_only = re.match(r"(\d{4})$", line)
-        if match_year_only and i + 1 < len(lines):
-            year = match_year_only.group(1)
-            amounts_line = lines[i + 1]
-            amounts = re.findall(r"\$[\d,\.]+", amounts_line)
-            if len(amounts) >= 3:
-                delinquent_amt = amounts[2]
-                delinquent_float = float(delinquent_amt.replace("$", "").replace(",", ""))
-                if delinquent_float > 0:
-                    delinquencies.append({"payoffAmount": f"${delinquent_float:,.2f}", "taxYear": year})
-            i += 2
-            continue
-        i += 1
+    delinquencies = [
+        {"payoffAmount": format_cents(cents), "taxYear": str(year)}
+        for year, cents in prior_delinquencies
+    ]
 
 
     # ------------------------------
@@ -183,46 +231,212 @@ def parse_raw_text(raw_text):
 
 
 # ------------------------------
-# Process Multiple Records
+# Parallel parse stage
 # ------------------------------
-def process_multiple_records():
-    with open(input_file, "r", encoding="utf-8") as f:
-        content = f.read()
-
-
-    records = re.findall(
-        r"(Property Information:.*?Due Dates:\s*May 12, 2025\s*November 10, 2025)",
-        content,
-        re.DOTALL
-    )
+def render_output(parsed_data, output_format="text"):
+    """JSON for one record: pretty-printed for the text file, a single line for JSONL."""
+    if output_format == "jsonl":
+        return json.dumps({"parcels": [parsed_data]}, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps({"parcels": [parsed_data]}, indent=4)
 
 
-    parsed_records = []
-    for idx, record in enumerate(records, 1):
-        print(f"Processing record #{idx} ...")
+# ------------------------------
+# Parsed-record cache (off unless a path is given)
+# ------------------------------
+parse_cache = None
+
+
+def init_parse_cache(path):
+    """Open the parse cache in this process; also the pool initializer for workers."""
+    global parse_cache
+    parse_cache = ParseCache(path, PARSER_VERSION) if path else None
+
+
+def cached_parse_raw_text(raw_text):
+    """parse_raw_text behind the parse cache, when one is open."""
+    if parse_cache is None:
+        return parse_raw_text(raw_text)
+    return parse_cache.get_or_parse(raw_text, parse_raw_text)
+
+
+def parse_chunk(jobs, output_format="text"):
+    """
+    Worker side: parse a chunk of (idx, record) jobs and pre-render their JSON so the
+    parent only writes. Records missing from the parse cache share one Tax History table.
+    """
+    parsed = {}
+    misses = []
+    for idx, record in jobs:
+        key = parse_cache.key(record) if parse_cache is not None else None
+        cached = parse_cache.get(key) if key is not None else None
+        if cached is None:
+            misses.append((idx, record, key))
+        else:
+            parsed[idx] = cached
+
+    errors = {}
+    try:
+        rows = batch_tax_history_rows([record for _, record, _ in misses])
+    except Exception:
+        rows = [None] * len(misses)  # parse each record on its own to find the bad one
+    for (idx, record, key), tax_rows in zip(misses, rows):
         try:
-            parsed_data = parse_raw_text(record)
-            parsed_records.append(parsed_data)
+            parsed[idx] = parse_raw_text(record, tax_rows)
         except Exception as e:
-            print(f"Error in record {idx}: {e}")
+            errors[idx] = str(e)
+            continue
+        if key is not None:
+            parse_cache.put(key, parsed[idx])
+
+    results = []
+    for idx, _ in jobs:
+        if idx in errors:
+            results.append((idx, None, None, errors[idx]))
+        else:
+            results.append((idx, parsed[idx], render_output(parsed[idx], output_format), None))
+    return results
+
+
+def imap_ordered(func, items, workers=1, chunksize=64, cache_path=None):
+    """
+    Map func over items and yield results in input order. With workers > 1 the
+    work runs in a process pool; items are fed in bounded windows so a huge
+    input file is never held in memory at once. cache_path opens the parse cache
+    in whichever process does the parsing.
+    """
+    if workers <= 1:
+        init_parse_cache(cache_path)
+        yield from map(func, items)
+        return
+
+    window = workers * chunksize * 4
+    items = iter(items)
+    with multiprocessing.Pool(processes=workers, initializer=init_parse_cache, initargs=(cache_path,)) as pool:
+        while True:
+            batch = list(itertools.islice(items, window))
+            if not batch:
+                break
+            yield from pool.imap(func, batch, chunksize=chunksize)
+
+
+def imap_chunks(func, items, workers=1, chunksize=64, cache_path=None):
+    """imap_ordered over lists of chunksize items; func returns one result per item, in order."""
+    items = iter(items)
+    chunks = iter(lambda: list(itertools.islice(items, chunksize)), [])
+    for results in imap_ordered(func, chunks, workers, 1, cache_path):
+        yield from results
 
 
-    # ------------------------------
-    # Save output as formatted TXT file
-    # ------------------------------
-    with open(output_txt_file, "w", encoding="utf-8") as out:
-        for idx, record in enumerate(parsed_records, 1):
-            json_block = json.dumps({"parcels": [record]}, indent=4)
-            out.write(f"--- Record {idx} ---\n{json_block}\n\n")
+# ------------------------------
+# Process Multiple Records
+# ------------------------------
+def process_multiple_records(workers=1, chunksize=64, output_format="text", output_file=None, cache_path=None):
+    output_file = output_file or (output_jsonl_file if output_format == "jsonl" else output_txt_file)
+    processed = 0
+    jobs = enumerate(iter_raw_records(input_file), 1)
+    job = functools.partial(parse_chunk, output_format=output_format)
+    with open(output_file, "w", encoding="utf-8") as out:
+        for idx, parsed_data, json_block, error in imap_chunks(job, jobs, workers, chunksize, cache_path):
+            print(f"Processing record #{idx} ...")
+            if error is not None:
+                print(f"Error in record {idx}: {error}")
+                continue
+
+            processed += 1
+            if output_format == "jsonl":
+                # One {"parcels": [...]} object per line
+                out.write(json_block + "\n")
+                continue
+
+            # ------------------------------
+            # Save output as formatted TXT file, one record at a time
+            # ------------------------------
+            out.write(f"--- Record {processed} ---\n{json_block}\n\n")
             out.write("--------------------------------------------------------------------------------\n\n")
 
 
-    print(f"\nSuccessfully processed {len(parsed_records)} records.")
-    print(f"Output saved to: {output_txt_file}")
+    print(f"\nSuccessfully processed {processed} records.")
+    print(f"Output saved to: {output_file}")
+
+
+# ------------------------------
+# Incremental run: only new or changed records
+# ------------------------------
+def process_changed_records(workers=1, chunksize=64, output_file=None, cache_path=None):
+    """
+    Parse only the raw records whose content hash differs from the manifest and
+    merge them into the existing JSONL output by parcel number.
+    """
+    output_file = output_file or output_jsonl_file
+    manifest = Manifest(manifest_path(output_file), target_path=output_file)
+    pending = {}
+    skipped = 0
+
+    def changed_jobs():
+        nonlocal skipped
+        for idx, record in enumerate(iter_raw_records(input_file), 1):
+            key = parcel_number(record)
+            if not key:
+                print(f"Record {idx} has no parcel number; it cannot be merged and is skipped.")
+                continue
+            # A parser bump changes every digest, so the whole output is re-parsed once
+            digest = content_hash(PARSER_VERSION, record)
+            if manifest.unchanged(key, digest):
+                skipped += 1
+                continue
+            pending[idx] = (key, digest)
+            yield idx, record
+
+    job = functools.partial(parse_chunk, output_format="jsonl")
+    updates = {}
+    digests = {}
+    for idx, parsed_data, json_block, error in imap_chunks(job, changed_jobs(), workers, chunksize, cache_path):
+        key, digest = pending.pop(idx)
+        print(f"Processing record #{idx} ...")
+        if error is not None:
+            print(f"Error in record {idx}: {error}")
+            continue
+        updates[key] = json_block
+        digests[key] = digest
+
+    replaced, appended = merge_jsonl(output_file, updates, output_parcel_number)
+    # Only after the output file is swapped in, so a crash just means re-parsing
+    for key, digest in digests.items():
+        manifest.update(key, digest)
+    manifest.save()
+
+    print(f"\n{len(updates)} records parsed ({replaced} changed, {appended} new), {skipped} unchanged.")
+    print(f"Output saved to: {output_file}")
 
 
 # ------------------------------
 # Run script
 # ------------------------------
 if __name__ == "__main__":
-    process_multiple_records()
+    parser = argparse.ArgumentParser(description="Convert raw text records into JSON output.")
+    parser.add_argument("--workers", type=int, default=1, help="parse processes (0 = one per CPU core)")
+    parser.add_argument("--chunksize", type=int, default=64, help="records handed to a worker at a time, parsed with one Tax History table")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text", help="'text' record blocks or one JSON object per line")
+    parser.add_argument("--output", help="output file (default depends on --format)")
+    parser.add_argument("--incremental", action="store_true", help="only parse new or changed records and merge them into the JSONL output")
+    parser.add_argument("--parse-cache", default=parse_cache_file, help="SQLite parse cache ('' to turn it off)")
+    args = parser.parse_args()
+
+    if args.incremental:
+        if args.format != "jsonl":
+            parser.error("--incremental needs --format jsonl")
+        process_changed_records(
+            workers=args.workers or os.cpu_count(),
+            chunksize=args.chunksize,
+            output_file=args.output,
+            cache_path=args.parse_cache,
+        )
+        sys.exit(0)
+
+    process_multiple_records(
+        workers=args.workers or os.cpu_count(),
+        chunksize=args.chunksize,
+        output_format=args.format,
+        output_file=args.output,
+        cache_path=args.parse_cache,
+    )
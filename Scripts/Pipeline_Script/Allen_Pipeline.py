@@ -0,0 +1,160 @@
+import argparse
+import functools
+import json
+import os
+import sys
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.append(SCRIPTS_DIR)
+sys.path.append(os.path.join(SCRIPTS_DIR, "Output_Script"))
+sys.path.append(os.path.join(SCRIPTS_DIR, "Dataset_Script"))
+
+import Allen_Dataset as dataset_stage
+import Allen_Output as output_stage
+from common.raw_records import dataset_input_text, iter_raw_records
+
+
+# ==========================================================
+# Raw text -> parsed output -> dataset row, in one pass
+# ==========================================================
+# Each raw record is parsed once; the output JSON and the dataset row are both
+# built from that parse, so neither stage has to re-read or re-split a file and
+# the dataset row always belongs to the record it was built from.
+
+RECORD_RULE = "--------------------------------------------------------------------------------"
+
+
+def pipeline_job(job, output_format=None, dataset_format=None):
+    """Worker side: parse one raw record and render whichever sinks are enabled."""
+    idx, record = job
+    try:
+        parsed_data = output_stage.cached_parse_raw_text(record)
+    except Exception as e:
+        return idx, None, None, str(e)
+
+    output_block = None
+    if output_format:
+        output_block = output_stage.render_output(parsed_data, output_format)
+
+    dataset_block = None
+    if dataset_format:
+        # build_dataset_row reorders keys in place, so render the output first
+        row = dataset_stage.build_dataset_row(dataset_input_text(record), {"parcels": [parsed_data]})
+        if dataset_format == "jsonl":
+            dataset_block = json.dumps(row, ensure_ascii=False)
+        else:
+            # Same layout json.dump(dataset, indent=2) gives an array element
+            dataset_block = "  " + json.dumps(row, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+    return idx, output_block, dataset_block, None
+
+
+# ------------------------------
+# Sinks
+# ------------------------------
+class OutputSink:
+    """Output records in the Output script's text layout or as JSONL."""
+
+    def __init__(self, path, output_format="text"):
+        self.path = path
+        self.output_format = output_format
+        self.count = 0
+        self._f = open(path, "w", encoding="utf-8")
+
+    def write(self, block):
+        self.count += 1
+        if self.output_format == "jsonl":
+            self._f.write(block + "\n")
+        else:
+            self._f.write(f"--- Record {self.count} ---\n{block}\n\n")
+            self._f.write(RECORD_RULE + "\n\n")
+
+    def close(self):
+        self._f.close()
+
+
+class DatasetSink:
+    """Dataset rows as JSONL, or streamed into the same JSON array save_dataset writes."""
+
+    def __init__(self, path, dataset_format="jsonl"):
+        self.path = path
+        self.dataset_format = dataset_format
+        self.count = 0
+        self._f = open(path, "w", encoding="utf-8")
+
+    def write(self, block):
+        if self.dataset_format == "jsonl":
+            self._f.write(block + "\n")
+        else:
+            self._f.write(("[\n" if self.count == 0 else ",\n") + block)
+        self.count += 1
+
+    def close(self):
+        if self.dataset_format == "json":
+            self._f.write("\n]" if self.count else "[]")
+        self._f.close()
+
+
+# ------------------------------
+# Run the pipeline
+# ------------------------------
+def run_pipeline(records, output_sink=None, dataset_sink=None, workers=1, chunksize=64, cache_path=None):
+    """
+    Feed raw records (read from a file or handed over by a scraper) through the
+    parser once and write them to whichever sinks are given.
+    Returns (processed, [(idx, error), ...]).
+    """
+    job = functools.partial(
+        pipeline_job,
+        output_format=output_sink.output_format if output_sink else None,
+        dataset_format=dataset_sink.dataset_format if dataset_sink else None,
+    )
+    processed = 0
+    errors = []
+    for idx, output_block, dataset_block, error in output_stage.imap_ordered(job, enumerate(records, 1), workers, chunksize, cache_path):
+        if error is not None:
+            print(f"Error in record {idx}: {error}")
+            errors.append((idx, error))
+            continue
+        processed += 1
+        if output_sink:
+            output_sink.write(output_block)
+        if dataset_sink:
+            dataset_sink.write(dataset_block)
+    return processed, errors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse raw text once and write the output and/or dataset files.")
+    parser.add_argument("--input", default=output_stage.input_file, help="raw text file")
+    parser.add_argument("--output", help="output file; omit to skip the output sink")
+    parser.add_argument("--output-format", choices=output_stage.OUTPUT_FORMATS, default="text")
+    parser.add_argument("--dataset", help="dataset file; omit to skip the dataset sink")
+    parser.add_argument("--dataset-format", choices=("json", "jsonl"), default="jsonl")
+    parser.add_argument("--workers", type=int, default=1, help="parse processes (0 = one per CPU core)")
+    parser.add_argument("--chunksize", type=int, default=64, help="records handed to a worker at a time")
+    parser.add_argument("--parse-cache", default=output_stage.parse_cache_file, help="SQLite parse cache ('' to turn it off)")
+    args = parser.parse_args()
+
+    if not args.output and not args.dataset:
+        parser.error("give --output, --dataset or both")
+
+    output_sink = OutputSink(args.output, args.output_format) if args.output else None
+    dataset_sink = DatasetSink(args.dataset, args.dataset_format) if args.dataset else None
+    try:
+        processed, errors = run_pipeline(
+            iter_raw_records(args.input),
+            output_sink,
+            dataset_sink,
+            workers=args.workers or os.cpu_count(),
+            chunksize=args.chunksize,
+            cache_path=args.parse_cache,
+        )
+    finally:
+        for sink in (output_sink, dataset_sink):
+            if sink:
+                sink.close()
+
+    print(f"\nSuccessfully processed {processed} records ({len(errors)} failed).")
+    for sink in (output_sink, dataset_sink):
+        if sink:
+            print(f"Saved to: {sink.path}")
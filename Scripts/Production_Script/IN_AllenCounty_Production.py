@@ -1,6 +1,7 @@
+import logging
 import os
 import re
-import time
+import sys
 import urllib.parse
 import requests
 import fitz  # PyMuPDF
@@ -14,8 +15,56 @@ from selenium.common.exceptions import TimeoutException
 from driver_.chromeBrowser import driver_access
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.session_pool import DriverPool
+from common.http_detail import DETAIL_SECTIONS, fetch_detail_sections, section_blocks
+from common.pagination import RowCache, iter_result_rows, row_matches
+from common.readiness import read_stable_sections, readiness_timings, wait_for_stable_text
+from common.due_dates import DUE_DATES_URL, due_date_cache, pay_year_from_text
+from common.duplicate_index import duplicate_index
+from common.tracing import fail, step_tracer
+from common.browser_profiles import apply_profile, browser_profile, check_profile, record_page_weight
+
 load_dotenv()
 
+log = logging.getLogger("allen.production")
+
+# Per-step spans of every scrape, appended here at the end of a run
+step_trace_file = os.getenv("STEP_TRACE_FILE", "step_trace.jsonl")
+
+
+# ------------------------------
+# Browser session pool
+# ------------------------------
+def new_driver():
+    # driver_access() owns the launch options, so BROWSER_PROFILE=lean can only add
+    # request blocking here; headless and the eager page load need its own options
+    return apply_profile(driver_access(), browser_profile)
+
+
+# Traces and benchmarks label it by what this browser actually gets
+step_tracer.tags["browser_profile"] = "block-only" if check_profile(browser_profile) == "lean" else browser_profile
+
+driver_pool = DriverPool(
+    new_driver,
+    size=int(os.getenv("DRIVER_POOL_SIZE", "2")),
+    max_uses=int(os.getenv("DRIVER_MAX_USES", "50")),
+)
+
+# County search page; point it at a local stand-in server for offline benchmarks
+county_site_url = os.getenv("COUNTY_SITE_URL", "https://lowtaxinfo.com/allencounty")
+
+# Search-result rows already read, so no result page is loaded twice
+result_row_cache = RowCache()
+
+# "selenium" loads the detail page in Chrome; "http" fetches it directly and
+# only falls back to Chrome when the sections are rendered by JavaScript
+detail_fetch_mode = os.getenv("DETAIL_FETCH_MODE", "selenium")
+
+# How Chrome reads the detail sections: "elements" waits for and reads each one in
+# turn; "script" waits once and reads all four with a single script call per poll
+detail_extract = os.getenv("DETAIL_EXTRACT", "elements")
+
 
 # ------------------------------
 # Helper function
@@ -23,44 +72,202 @@ load_dotenv()
 def normalize_string(s):
     return re.sub(r'[^a-zA-Z0-9]', '', s).lower()
 
-# Example inputs
-# search_type = "address"
-# search_value = "6201 Thimlar Rd New Haven, IN 46774"
-# name = "Smith Karen K"
+
+def extract_detail_selenium(driver, generated_url):
+    """Steps 7-11 in the browser: returns (raw text of the four detail sections, whether every step succeeded)."""
+    data = ""
+    loaded = True
+
+
+    # ------------------------------
+    # STEP 7: Navigate to Generated URL and Wait for Page Load
+    # ------------------------------
+    with step_tracer.step("step7", driver) as span:
+        try:
+            # Navigate to the URL generated in Step 6
+            driver.get(generated_url)
+
+            # Wait for the 'parcel' container to appear and its content to settle
+            wait_for_stable_text(driver, (By.ID, "parcel"), "parcel", timeout=30)
+            record_page_weight(driver, span)
+            log.info("Navigated to the generated URL and loaded successfully.")
+
+
+        except TimeoutException as e:
+            fail(span, e, "timeout")
+            loaded = False
+            data +=("'parcel' element did not load in time.")
+        except Exception as e:
+            fail(span, e)
+            loaded = False
+            data += f"Step 7 failed: {e}\n"
+
+    # ------------------------------
+    # STEP 8: Extract Property Information
+    # ------------------------------
+    with step_tracer.step("step8", driver) as span:
+        try:
+            # Wait for the 'info' element to appear and its text to settle
+            property_info_text = wait_for_stable_text(driver, (By.ID, "info"), "info", timeout=30)
+
+            data +=("\nProperty Information:\n")
+            data +=(property_info_text)+"\n"
+
+        except TimeoutException as e:
+            fail(span, e, "timeout")
+            loaded = False
+            data +=("'info' element did not load in time.")
+        except Exception as e:
+            fail(span, e)
+            loaded = False
+            data += f"Step 8 failed: {e}\n"
+
+
+    # ------------------------------
+    # STEP 9: Extract Tax Information
+    # ------------------------------
+    with step_tracer.step("step9", driver) as span:
+        try:
+            # Wait for the 'billing-detail' element to appear and its text to settle
+            tax_info_text = wait_for_stable_text(driver, (By.ID, "billing-detail"), "billing-detail", timeout=30)
+
+            data +=("\nTax Information:\n")
+            data +=(tax_info_text)+"\n"
+
+        except TimeoutException as e:
+            fail(span, e, "timeout")
+            loaded = False
+            data +=("'billing-detail' element did not load in time.")
+        except Exception as e:
+            fail(span, e)
+            loaded = False
+            data += f"Step 9 failed: {e}\n"
 
 
-def scrape_data(search_type, search_value, name):
+    # ------------------------------
+    # STEP 10: Extract Payment History
+    # ------------------------------
+    with step_tracer.step("step10", driver) as span:
+        try:
+            # Wait for the 'payment-history' element to appear and its text to settle
+            payment_history_text = wait_for_stable_text(driver, (By.ID, "payment-history"), "payment-history", timeout=30)
+
+            data +=("\nPayment History:\n")
+            data +=(payment_history_text)+"\n"
+
+        except TimeoutException as e:
+            fail(span, e, "timeout")
+            loaded = False
+            data +=("'payment-history' element did not load in time.")
+        except Exception as e:
+            fail(span, e)
+            loaded = False
+            data += f"Step 10 failed: {e}\n"
+
+
+    # ------------------------------
+    # STEP 11: Extract Tax History
+    # ------------------------------
+    with step_tracer.step("step11", driver) as span:
+        try:
+            # Wait for the 'tax-history' element to appear and its text to settle
+            tax_history_text = wait_for_stable_text(driver, (By.ID, "tax-history"), "tax-history", timeout=30)
+
+            data +=("\nTax History:\n")
+            data +=(tax_history_text)+"\n"
+
+        except TimeoutException as e:
+            fail(span, e, "timeout")
+            loaded = False
+            data +=("'tax-history' element did not load in time.")
+        except Exception as e:
+            fail(span, e)
+            loaded = False
+            data += f"Step 11 failed: {e}\n"
+
+
+    return data, loaded
+
+
+def extract_detail_script(driver, generated_url):
+    """Steps 7-11 with one wait: same (text, loaded) as extract_detail_selenium in a couple of round-trips."""
     data = ""
-    driver = driver_access()
-    wait = WebDriverWait(driver, 15)
-    normalized_partial_name = normalize_string(name)
-    normalized_partial_address = normalize_string(search_value)
+    loaded = True
 
 
-    try:
-        if search_type.lower() != "address":
-            ("Only 'address' search_type is supported for this County.")
-            return None
+    # ------------------------------
+    # STEP 7: Navigate to Generated URL
+    # ------------------------------
+    with step_tracer.step("step7", driver) as span:
+        try:
+            driver.get(generated_url)
+            record_page_weight(driver, span)
+            log.info("Navigated to the generated URL.")
+
+        except Exception as e:
+            fail(span, e)
+            loaded = False
+            data += f"Step 7 failed: {e}\n"
+
+
+    # ------------------------------
+    # STEP 8-11: Read all four sections once their text has settled
+    # ------------------------------
+    with step_tracer.step("step8-11", driver) as span:
+        try:
+            texts = read_stable_sections(driver, [section_id for section_id, _ in DETAIL_SECTIONS], timeout=30)
+            for section_id, title in DETAIL_SECTIONS:
+                if texts[section_id] is not None:
+                    data += f"\n{title}:\n{texts[section_id]}\n"
+                else:
+                    span["outcome"] = "timeout"
+                    loaded = False
+                    data += f"'{section_id}' element did not load in time."
+
+        except Exception as e:
+            fail(span, e)
+            loaded = False
+            data += f"Step 8-11 failed: {e}\n"
+
+
+    return data, loaded
 
 
-        driver = driver_access()
-        county_site_url = "https://lowtaxinfo.com/allencounty"
+def scrape_due_dates(driver):
+    driver.get(DUE_DATES_URL)
+
+    # Wait for the second <ul> to load (using XPath) and its text to settle
+    text = wait_for_stable_text(driver, (By.XPATH, "(//ul)[2]"), "due-dates", timeout=30)
+    record_page_weight(driver, step_tracer.current() or {})
+    return text
+
+
+def search_duplicate(driver, county_site_url, search_value, name):
+    """Steps 1-6: search by owner and address and read the matching row's Duplicate#. Returns (duplicate, step log)."""
+    data = ""
+    duplicate_value = None
+    normalized_partial_name = normalize_string(name)
+    normalized_partial_address = normalize_string(search_value)
 
 
-        # ------------------------------
-        # STEP 1: Open the website
-        # ------------------------------
+    # ------------------------------
+    # STEP 1: Open the website
+    # ------------------------------
+    with step_tracer.step("step1", driver) as span:
         try:
             driver.get(county_site_url)
             driver.maximize_window()
-            ("URL loaded successfully.\n")
+            record_page_weight(driver, span)
+            log.info("URL loaded successfully.")
         except Exception as e:
+            fail(span, e)
             data += f"Step 1 failed: {e}\n"
 
 
-        # ------------------------------
-        # STEP 2: Enter Owner Name and Address, then Wait for Table to Load
-        # ------------------------------
+    # ------------------------------
+    # STEP 2: Enter Owner Name and Address, then Wait for Table to Load
+    # ------------------------------
+    with step_tracer.step("step2", driver) as span:
         try:
             # Extract first 2 or 3 words from the owner name
             owner_words = name.split()
@@ -75,7 +282,7 @@ def scrape_data(search_type, search_value, name):
             )
             owner_input.clear()
             owner_input.send_keys(owner_input_text)
-            (f"Owner name entered: {owner_input_text}")
+            log.info(f"Owner name entered: {owner_input_text}")
 
             # Wait for the address input box and type the address
             address_input = WebDriverWait(driver, 15).until(
@@ -84,7 +291,7 @@ def scrape_data(search_type, search_value, name):
             address_input.clear()
             address_input.send_keys(search_value)
             address_input.send_keys(Keys.ENTER)
-            (f"Address entered: {search_value}")
+            log.info(f"Address entered: {search_value}")
 
             # Wait for the table to appear
             table_element = WebDriverWait(driver, 30).until(
@@ -95,297 +302,194 @@ def scrape_data(search_type, search_value, name):
             WebDriverWait(driver, 30).until(
                 lambda d: len(d.find_elements(By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr")) > 0
             )
-            ("Table is loaded successfully.\n")
+            log.info("Table is loaded successfully.")
 
-        except TimeoutException:
+        except TimeoutException as e:
+            fail(span, e, "timeout")
             data +=("Table did not load in time.")
         except Exception as e:
+            fail(span, e)
             data += f"Step 2 failed: {e}\n"
 
 
-        # ------------------------------
-        # STEP 3 & 4: Detect Pagination and Extract All Table Rows
-        # ------------------------------
+    # ------------------------------
+    # STEP 3-5: Scan Result Pages Once and Stop at the First Matching Record
+    # ------------------------------
+    with step_tracer.step("step3-5", driver) as span:
         try:
-            # Default to single page
-            start_page = 1
-            end_page = 1
-
-            # Try detecting pagination
-            try:
-                pagination = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "ul.pagination"))
-                )
-
-                # Extract all page number elements
-                page_links = pagination.find_elements(By.CSS_SELECTOR, "li.page-item a.page-link")
-
-                page_numbers = []
-                for link in page_links:
-                    text = link.text.strip()
-                    if text.isdigit():  # ignore 'Previous', 'Next', '...'
-                        page_numbers.append(int(text))
-
-                if page_numbers:
-                    start_page = min(page_numbers)
-                    end_page = max(page_numbers)
-                    (f"Pagination detected: Start Page = {start_page}, End Page = {end_page}")
-                else:
-                    data +=("Pagination not found, assuming single page result.")
-
-            except TimeoutException:
-                ("No pagination visible — only one page of results.")
-                start_page = 1
-                end_page = 1
-
-            # Loop through each page and extract table rows
-            for page in range(start_page, end_page + 1):
-                (f"\nProcessing Page {page}...")
-
-                # Build URL manually if multiple pages exist
-                if end_page > 1:
-                    page_url = f"https://lowtaxinfo.com/allencounty?address={search_value.replace(' ', '%20')}&page={page}"
-                    driver.get(page_url)
-
-                # Wait for table rows to load
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr"))
-                )
-
-                # Extract all rows
-                rows = driver.find_elements(By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr")
-
-                if not rows:
-                    data +=(f"No rows found on Page {page}")
-                    continue
-
-                # Print row data
-                for i, row in enumerate(rows, start=1):
-                    (f"{page}.{i}. {row.text.strip()}")
-
-                (f"Completed extracting Page {page} ({len(rows)} rows)")
-
-
-        except TimeoutException:
-            data +=("Table did not load properly on one of the pages.")
-        except Exception as e:
-            data += f"Step 3 & 4 failed: {e}\n"
-
-        # ------------------------------
-        # STEP 5: Find Matching Record
-        # ------------------------------
-        try:
-            # Reuse the normalize_string function from before
             matched_found = False
 
-            # Loop through each page again
-            for page in range(start_page, end_page + 1):
-                (f"\nSearching for match in Page {page}...")
-
-                # Build URL manually if multiple pages exist
-                if end_page > 1:
-                    page_url = f"https://lowtaxinfo.com/allencounty?address={search_value.replace(' ', '%20')}&page={page}"
-                    driver.get(page_url)
-
-                # Wait for table rows to load
-                WebDriverWait(driver, 20).until(
-                    EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr"))
-                )
+            # Pages are loaded lazily, so every page after the match is skipped
+            for page, i, row_text in iter_result_rows(
+                driver, county_site_url, owner_input_text, search_value, result_row_cache
+            ):
+                log.debug(f"{page}.{i}. {row_text}")
 
-                rows = driver.find_elements(By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr")
-
-                for i, row in enumerate(rows, start=1):
-                    row_text = row.text.strip()
-                    normalized_row = normalize_string(row_text)
-
-                    if normalized_partial_name in normalized_row and normalized_partial_address in normalized_row:
-                        (f"\nMatched Record Found on Page {page}, Row {i}:")
-                        (row_text)
-                        matched_found = True
-                        matched_row_text = row_text
-                        break  # stop after first match
-
-                if matched_found:
-                    break  # stop searching if match found
+                if row_matches(row_text, normalized_partial_name, normalized_partial_address):
+                    log.info(f"Matched Record Found on Page {page}, Row {i}:")
+                    log.info(row_text)
+                    matched_found = True
+                    matched_row_text = row_text
+                    break  # stop after first match
 
             if not matched_found:
+                span["outcome"] = "no_match"
                 data +=("No matching record found in any page.")
 
+        except TimeoutException as e:
+            fail(span, e, "timeout")
+            data +=("Table did not load properly on one of the pages.")
         except Exception as e:
-            data += f"Step 5 failed: {e}\n"
+            fail(span, e)
+            data += f"Step 3-5 failed: {e}\n"
 
-        # ------------------------------
-        # STEP 6: Extract Duplicate# and Generate URL
-        # ------------------------------
+    # ------------------------------
+    # STEP 6: Extract Duplicate#
+    # ------------------------------
+    with step_tracer.step("step6", driver) as span:
         try:
             # Ensure matched_row_text is defined from Step 5
             duplicate_match = re.search(r"Duplicate#\s*(\d+)", matched_row_text)
 
             if duplicate_match:
                 duplicate_value = duplicate_match.group(1)
-                (f"Duplicate# extracted: {duplicate_value}")
-
-                # Get current year
-                current_year = datetime.now().year
-
-                # Generate URL in the requested format
-                generated_url = f"https://lowtaxinfo.com/allencounty/{duplicate_value}-{current_year}"
-                (f"Generated URL: {generated_url}")
-
+                log.info(f"Duplicate# extracted: {duplicate_value}")
             else:
+                span["outcome"] = "no_match"
                 data +=("Duplicate# not found in the matched record.")
 
         except Exception as e:
+            fail(span, e)
             data += f"Step 6 failed: {e}\n"
 
-
-        # ------------------------------
-        # STEP 7: Navigate to Generated URL and Wait for Page Load
-        # ------------------------------
-        try:
-            # Navigate to the URL generated in Step 6
-            driver.get(generated_url)
-    
-            # Wait for the element with ID 'parcel' to appear
-            parcel_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "parcel"))
-            )
-            time.sleep(4)
-            ("Navigated to the generated URL and loaded successfully.")
+    return duplicate_value, data
 
 
-        except TimeoutException:
-            data +=("'parcel' element did not load in time.")
-        except Exception as e:
-            data += f"Step 7 failed: {e}\n"
-
-        # ------------------------------
-        # STEP 8: Extract Property Information
-        # ------------------------------
-        try:
-            # Wait for the element with ID 'info' to appear
-            info_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "info"))
-            )
-            time.sleep(2)
-
-            # Get the raw text of the 'info' element
-            property_info_text = info_element.text.strip()
-
-            data +=("\nProperty Information:\n")
-            data +=(property_info_text)+"\n"
-
-        except TimeoutException:
-            data +=("'info' element did not load in time.")
-        except Exception as e:
-            data += f"Step 8 failed: {e}\n"
-
-
-        # ------------------------------
-        # STEP 9: Extract Tax Information
-        # ------------------------------
-        try:
-            # Wait for the element with ID 'billing-detail' to appear
-            billing_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "billing-detail"))
-            )
-            time.sleep(2)
-
-            # Get the raw text of the 'billing-detail' element
-            tax_info_text = billing_element.text.strip()
-
-            data +=("\nTax Information:\n")
-            data +=(tax_info_text)+"\n"
-
-        except TimeoutException:
-            data +=("'billing-detail' element did not load in time.")
-        except Exception as e:
-            data += f"Step 9 failed: {e}\n"
-
-
-        # ------------------------------
-        # STEP 10: Extract Payment History
-        # ------------------------------
-        try:
-            # Wait for the element with ID 'payment-history' to appear
-            payment_history_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "payment-history"))
-            )
-            time.sleep(2)
-
-            # Get the raw text of the 'payment-history' element
-            payment_history_text = payment_history_element.text.strip()
-
-            data +=("\nPayment History:\n")
-            data +=(payment_history_text)+"\n"
-
-        except TimeoutException:
-            data +=("'payment-history' element did not load in time.")
-        except Exception as e:
-            data += f"Step 10 failed: {e}\n"
+def scrape_data(search_type, search_value, name, pool=None, fetch_mode=None):
+    data = ""
+    pool = pool or driver_pool
+    fetch_mode = fetch_mode or detail_fetch_mode
+    driver = pool.acquire()
+    driver_broken = False
+    wait = WebDriverWait(driver, 15)
 
 
-        # ------------------------------
-        # STEP 11: Extract Tax History
-        # ------------------------------
+    with step_tracer.record(search_value):
         try:
-            # Wait for the element with ID 'tax-history' to appear
-            tax_history_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.ID, "tax-history"))
-            )
-            time.sleep(2)
-
-            # Get the raw text of the 'tax-history' element
-            tax_history_text = tax_history_element.text.strip()
-
-            data +=("\nTax History:\n")
-            data +=(tax_history_text)+"\n"
+            if search_type.lower() != "address":
+                log.warning("Only 'address' search_type is supported for this County.")
+                return None
+
+
+            # ------------------------------
+            # STEP 1-6: Duplicate# from the index, else from the search form
+            # ------------------------------
+            # Duplicate# is stable across years, so repeat parcels skip the search and pagination
+            with step_tracer.step("index") as span:
+                duplicate_value = duplicate_index.get(county_site_url, search_value, name)
+                from_index = duplicate_value is not None
+                span["outcome"] = "hit" if from_index else "miss"
+            if from_index:
+                log.info(f"Duplicate# from the index: {duplicate_value}")
+            else:
+                duplicate_value, search_log = search_duplicate(driver, county_site_url, search_value, name)
+                data += search_log
+                if duplicate_value:
+                    duplicate_index.put(county_site_url, search_value, name, duplicate_value)
 
-        except TimeoutException:
-            data +=("'tax-history' element did not load in time.")
+            if duplicate_value:
+                # Generate URL in the requested format
+                current_year = datetime.now().year
+                generated_url = f"{county_site_url}/{duplicate_value}-{current_year}"
+                log.info(f"Generated URL: {generated_url}")
+
+
+            # ------------------------------
+            # STEP 7-11: Load the detail page and extract its sections
+            # ------------------------------
+            with step_tracer.step("step7-11", driver) as span:
+                detail_loaded = False
+                try:
+                    detail_sections = None
+                    if fetch_mode == "http":
+                        detail_sections = fetch_detail_sections(generated_url)
+                        if detail_sections is None:
+                            log.info("Detail page is JS-rendered or missing, falling back to Selenium.")
+
+                    if detail_sections is not None:
+                        for block in section_blocks(detail_sections):
+                            data += block + "\n"
+                        detail_loaded = True
+                    else:
+                        # The extractors log failed steps into the text and report them in detail_loaded
+                        extract = extract_detail_script if detail_extract == "script" else extract_detail_selenium
+                        detail_data, detail_loaded = extract(driver, generated_url)
+                        data += detail_data
+
+                except Exception as e:
+                    fail(span, e)
+                    data += f"Step 7-11 failed: {e}\n"
+
+                if not detail_loaded:
+                    if span["outcome"] == "ok":
+                        span["outcome"] = "error"
+                    if from_index:
+                        # The indexed Duplicate# may be stale; search again next time
+                        log.info("Detail page did not load, dropping the indexed Duplicate#.")
+                        duplicate_index.forget(county_site_url, search_value, name)
+
+
+            # ------------------------------
+            # STEP 12: Extract Property Tax Due Dates
+            # ------------------------------
+            with step_tracer.step("step12", driver) as span:
+                try:
+                    # Due dates only change once a year, so indy.gov is scraped once per pay year
+                    pay_year = pay_year_from_text(data)
+                    tax_due_dates_text = due_date_cache.get_or_fetch(pay_year, lambda: scrape_due_dates(driver))
+
+                    data +=("\nDue Dates:\n")
+                    data +=(tax_due_dates_text)+"\n"
+
+                except TimeoutException as e:
+                    fail(span, e, "timeout")
+                    data+=("Tax Due Dates <ul> did not load in time.")
+                except Exception as e:
+                    fail(span, e)
+                    data += f"Step 12 failed: {e}\n"
         except Exception as e:
-            data += f"Step 11 failed: {e}\n"
+            data +=(f"Unexpected error: {e}")
+            driver_broken = True
+            return None
 
 
-        # ------------------------------
-        # STEP 12: Extract Property Tax Due Dates
-        # ------------------------------
-        try:
-            indy_url = "https://www.indy.gov/activity/find-property-tax-due-dates"
-            driver.get(indy_url)
+        finally:
+            pool.release(driver, broken=driver_broken)
+            log.info("Browser returned to the session pool.")
 
-            # Wait for the second <ul> to load (using XPath)
-            ul_element = WebDriverWait(driver, 30).until(
-                EC.presence_of_element_located((By.XPATH, "(//ul)[2]"))
-            )
-            time.sleep(2)
 
-            # Extract the raw text from the <ul>
-            tax_due_dates_text = ul_element.text.strip()
+            return data
 
-            data +=("\nDue Dates:\n")
-            data +=(tax_due_dates_text)+"\n"
 
-        except TimeoutException:
-            data+=("Tax Due Dates <ul> did not load in time.")
-        except Exception as e:
-            data += f"Step 12 failed: {e}\n"
-    except Exception as e:
-        data +=(f"Unexpected error: {e}")
-        return None
+if __name__ == "__main__":
+    # Example inputs
+    search_type = "address"
+    search_value = "6201 Thimlar Rd New Haven, IN 46774"
+    name = "Smith Karen K"
 
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
 
+    # Call the function
+    try:
+        result = scrape_data(search_type, search_value, name)
     finally:
-        driver.quit()
-        ("\nBrowser closed successfully.")
-
-
-        return data
-
-
-# Call the function
-result = scrape_data(search_type, search_value, name)
+        print(driver_pool.stats())
+        print(readiness_timings.summary())
+        print("Duplicate index:", duplicate_index.stats())
+        step_tracer.dump(step_trace_file)
+        step_tracer.print_summary()
+        driver_pool.close()
 
 
-# Print output
-print(result)
+    # Print output
+    print(result)
@@ -1,6 +1,8 @@
+import argparse
+import logging
 import os
 import re
-import time
+import sys
 from dotenv import load_dotenv
 from datetime import datetime
 from selenium import webdriver
@@ -10,10 +12,26 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.http_detail import DETAIL_SECTIONS, fetch_detail_sections, section_blocks
+from common.pagination import RowCache, iter_result_rows, row_matches
+from common.readiness import read_stable_sections, readiness_timings, wait_for_stable_text
+from common.due_dates import DUE_DATES_URL, due_date_cache, pay_year_from_text
+from common.raw_text_sink import RawTextSink
+from common.duplicate_index import duplicate_index
+from common.checkpoint import CheckpointJournal, record_key, resume_sink
+from common.session_pool import DriverPool
+from common.tracing import step_tracer
+from common.browser_profiles import (
+    BROWSER_PROFILES, apply_profile, browser_profile, check_profile, profile_options, record_page_weight,
+)
 
 load_dotenv()
 
+log = logging.getLogger("allen.raw_text")
+
 # ============================================
 # Setup Chrome
 # ============================================
@@ -29,6 +47,21 @@ chrome_options.add_argument("--disable-gpu")
 chrome_options.add_argument("--ignore-ssl-errors")
 chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
 
+output_file = "perrycounty.rawtext.txt"
+# Start a new numbered output file every N records (0 keeps a single file)
+raw_text_sink = RawTextSink(output_file, rotate_every=int(os.getenv("RAW_TEXT_ROTATE_EVERY", "0")) or None)
+# Finished records and their output offsets, for --resume
+checkpoint_journal = CheckpointJournal(output_file + ".journal")
+# Per-step spans of every record, appended here at the end of a run
+step_trace_file = os.getenv("STEP_TRACE_FILE", "step_trace.jsonl")
+county_site_url = os.getenv("COUNTY_SITE_URL", "https://lowtaxinfo.com/perrycounty")
+# "selenium" or "http" (falls back to Selenium when the detail page is JS-rendered)
+fetch_mode = os.getenv("DETAIL_FETCH_MODE", "selenium")
+# "elements" reads the detail sections one by one, "script" all at once after a single wait
+detail_extract = os.getenv("DETAIL_EXTRACT", "elements")
+row_cache = RowCache()
+RECORD_SEPARATOR = "\n==========================================================================================\n"
+
 
 # ============================================
 # Helper functions
@@ -37,10 +70,37 @@ def normalize_string(s):
     return re.sub(r'[^a-zA-Z0-9]', '', s).lower()
 
 
-def log_to_file(content):
-    """Append text to the output file"""
-    with open("perrycounty.rawtext.txt", "a", encoding="utf-8") as f:
-        f.write(content + "\n")
+def write_record(blocks, key=None):
+    """Append every block of one scraped record to the output file in one write, then checkpoint it"""
+    location = raw_text_sink.write_record(blocks)
+    if key is not None:
+        raw_text_sink.flush()
+        checkpoint_journal.record(key, location)
+    return location
+
+
+def open_checkpoint(resume=False):
+    """Start a new journal, or on resume cut the output back to the last checkpoint; returns the finished keys"""
+    if not resume:
+        checkpoint_journal.start(raw_text_sink.current_path())
+        return set()
+    checkpoint_journal.load()
+    resume_sink(checkpoint_journal, raw_text_sink)
+    done = checkpoint_journal.done_keys()
+    print(f" Resuming: {len(done)} records already done.")
+    return done
+
+
+def new_driver():
+    driver = webdriver.Chrome(service=service, options=profile_options(chrome_options, browser_profile))
+    return apply_profile(driver, browser_profile)
+
+
+def use_browser_profile(profile):
+    """Pick the browser profile for drivers started from now on and tag the step trace with it"""
+    global browser_profile
+    browser_profile = check_profile(profile)
+    step_tracer.tags["browser_profile"] = profile
 
 
 # ============================================
@@ -75,39 +135,56 @@ names = [
 
 
 # ============================================
-# Process Each Record
+# Scrape One Record
 # ============================================
-
-for idx, (partial_address, partial_name) in enumerate(zip(addresses, names), start=1):
-    try:
-        # Header for each record
-        header = f"""
+def record_header(idx, partial_address):
+    return f"""
 --------------------------------------------------------------------------------
 {idx}. Search Address: {partial_address}
 --------------------------------------------------------------------------------
 """
-        print(header)
-        log_to_file(header)
 
-        driver = webdriver.Chrome(service=service, options=chrome_options)
 
-        normalized_partial_name_query = normalize_string(partial_name)
-        normalized_partial_address = normalize_string(partial_address)
+def scrape_record(pool, idx, partial_address, partial_name):
+    """Run Steps 1-12 for one record on a browser from the pool and return its raw-text blocks in file order"""
+    header = record_header(idx, partial_address)
+    print(header)
+    blocks = [header]
+    driver = pool.acquire()
+    broken = False
+    try:
+        with step_tracer.record(idx):
+            scrape_sections(driver, partial_address, partial_name, blocks)
+    except Exception as e:
+        blocks.append(f"Error in record {idx}: {e}")
+        # A section that did not load is the page's fault; any other WebDriver error may mean a dead browser
+        broken = isinstance(e, WebDriverException) and not isinstance(e, TimeoutException)
+    finally:
+        pool.release(driver, broken=broken)
+    blocks.append(RECORD_SEPARATOR)
+    return blocks
+
 
+def search_duplicate(driver, partial_address, partial_name, blocks):
+    """Steps 1-6: search by owner and address and return the matching row's Duplicate#, or None"""
+    normalized_partial_name_query = normalize_string(partial_name)
+    normalized_partial_address = normalize_string(partial_address)
 
-        county_site_url = "https://lowtaxinfo.com/perrycounty"
 
-        # ------------------------------
-        # STEP 1: Open the website
-        # ------------------------------
+    # ------------------------------
+    # STEP 1: Open the website
+    # ------------------------------
+    with step_tracer.step("step1", driver) as span:
         driver.get(county_site_url)
         driver.maximize_window()
-        ("Step 1: URL loaded successfully.\n")
+        record_page_weight(driver, span)
+        log.info("Step 1: URL loaded successfully.")
 
 
-        # ------------------------------
-        # STEP 2: Enter Owner Name and Address
-        # ------------------------------
+    # ------------------------------
+    # STEP 2: Enter Owner Name and Address
+    # ------------------------------
+    with step_tracer.step("step2", driver):
         owner_words = partial_name.split()
         owner_input_text = " ".join(owner_words[:2]) if len(owner_words) > 2 else partial_name
 
@@ -116,7 +193,7 @@ for idx, (partial_address, partial_name) in enumerate(zip(addresses, names), sta
         )
         owner_input.clear()
         owner_input.send_keys(owner_input_text)
-        (f"Owner name entered: {owner_input_text}")
+        log.info(f"Owner name entered: {owner_input_text}")
 
         address_input = WebDriverWait(driver, 15).until(
             EC.presence_of_element_located((By.ID, "address"))
@@ -124,7 +201,7 @@ for idx, (partial_address, partial_name) in enumerate(zip(addresses, names), sta
         address_input.clear()
         address_input.send_keys(partial_address)
         address_input.send_keys(Keys.ENTER)
-        (f"Address entered: {partial_address}")
+        log.info(f"Address entered: {partial_address}")
 
         # Wait for table to load
         WebDriverWait(driver, 30).until(
@@ -133,143 +210,200 @@ for idx, (partial_address, partial_name) in enumerate(zip(addresses, names), sta
         WebDriverWait(driver, 30).until(
             lambda d: len(d.find_elements(By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr")) > 0
         )
-        ("Table is loaded successfully.\n")
-
-
-        # ------------------------------
-        # STEP 3–4: Pagination & Extract Rows
-        # ------------------------------
-        start_page = 1
-        end_page = 1
-        try:
-            pagination = WebDriverWait(driver, 5).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "ul.pagination"))
-            )
-            page_links = pagination.find_elements(By.CSS_SELECTOR, "li.page-item a.page-link")
-            page_numbers = [int(l.text.strip()) for l in page_links if l.text.strip().isdigit()]
-            if page_numbers:
-                start_page, end_page = min(page_numbers), max(page_numbers)
-        except TimeoutException:
-            pass
+        log.info("Table is loaded successfully.")
 
 
+    # ------------------------------
+    # STEP 3–5: Scan result pages once, stop at the first match
+    # ------------------------------
+    with step_tracer.step("step3-5", driver) as span:
         matched_row_text = None
         matched_found = False
 
-
-        # ------------------------------
-        # STEP 5: Find Matching Record
-        # ------------------------------
-        for page in range(start_page, end_page + 1):
-            if end_page > 1:
-                driver.get(f"{county_site_url}?address={partial_address.replace(' ', '%20')}&page={page}")
-
-
-            WebDriverWait(driver, 20).until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr"))
-            )
-            rows = driver.find_elements(By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr")
-
-
-            for row in rows:
-                row_text = row.text.strip()
-                print(row_text)
-                normalized_row = normalize_string(row_text)
-                if normalized_partial_name_query in normalized_row and normalized_partial_address in normalized_row:
-                    (f"Matched Record Found: {row_text}")
-                    matched_found = True
-                    matched_row_text = row_text
-                    break
-            if matched_found:
+        for page, i, row_text in iter_result_rows(driver, county_site_url, owner_input_text, partial_address, row_cache):
+            log.debug(row_text)
+            if row_matches(row_text, normalized_partial_name_query, normalized_partial_address):
+                log.info(f"Matched Record Found: {row_text}")
+                matched_found = True
+                matched_row_text = row_text
                 break
 
 
         if not matched_found:
-            log_to_file("No matching record found.")
-            driver.quit()
-            continue
-
-        # ------------------------------
-        # STEP 6: Extract Duplicate# and Generate URL
-        # ------------------------------
+            span["outcome"] = "no_match"
+            blocks.append("No matching record found.")
+            return None
+
+    # ------------------------------
+    # STEP 6: Extract Duplicate#
+    # ------------------------------
+    with step_tracer.step("step6", driver) as span:
         duplicate_match = re.search(r"Duplicate#\s*(\d+)", matched_row_text)
-        if duplicate_match:
-            duplicate_value = duplicate_match.group(1)
-            current_year = datetime.now().year
-            generated_url = f"https://lowtaxinfo.com/perrycounty/{duplicate_value}-{current_year}"
-            (f"Generated URL: {generated_url}")
-        else:
-            log_to_file("Duplicate# not found.")
-            driver.quit()
-            continue
-
-
-        # ------------------------------
-        # STEP 7: Navigate to URL
-        # ------------------------------
+        if not duplicate_match:
+            span["outcome"] = "no_match"
+            blocks.append("Duplicate# not found.")
+            return None
+        return duplicate_match.group(1)
+
+
+def scrape_sections(driver, partial_address, partial_name, blocks):
+    if scrape_detail(driver, partial_address, partial_name, blocks):
+        append_due_dates(driver, blocks)
+
+
+def scrape_detail(driver, partial_address, partial_name, blocks):
+    """Steps 1-11 on the county site; returns False when there is no record to read"""
+    # ------------------------------
+    # STEP 1-6: Duplicate# from the index, else from the search form
+    # ------------------------------
+    # Duplicate# is stable across years, so repeat parcels skip the search and pagination
+    with step_tracer.step("index") as span:
+        duplicate_value = duplicate_index.get(county_site_url, partial_address, partial_name)
+        from_index = duplicate_value is not None
+        span["outcome"] = "hit" if from_index else "miss"
+    if not from_index:
+        duplicate_value = search_duplicate(driver, partial_address, partial_name, blocks)
+        if duplicate_value is None:
+            return False
+        duplicate_index.put(county_site_url, partial_address, partial_name, duplicate_value)
+
+    current_year = datetime.now().year
+    generated_url = f"{county_site_url}/{duplicate_value}-{current_year}"
+    log.info(f"Generated URL: {generated_url}")
+
+
+    # ------------------------------
+    # STEP 7-11 over HTTP when enabled
+    # ------------------------------
+    with step_tracer.step("step7-11", driver):
+        try:
+            detail_sections = fetch_detail_sections(generated_url) if fetch_mode == "http" else None
+            if detail_sections is not None:
+                blocks.extend(section_blocks(detail_sections))
+            elif detail_extract == "script":
+                scrape_detail_script(driver, generated_url, blocks)
+            else:
+                scrape_detail_sections(driver, generated_url, blocks)
+        except Exception:
+            if from_index:
+                # The indexed Duplicate# may be stale; search again next time
+                duplicate_index.forget(county_site_url, partial_address, partial_name)
+            raise
+        return True
+
+
+def append_due_dates(driver, blocks, tax_due_dates_text=None):
+    """Step 12: due dates for the record's pay year, from the cache or indy.gov (or text already looked up)"""
+    # ------------------------------
+    # STEP 12: Due Dates (Indy)
+    # ------------------------------
+    with step_tracer.step("step12", driver):
+        if tax_due_dates_text is None:
+            pay_year = pay_year_from_text("\n".join(blocks))
+            tax_due_dates_text = due_date_cache.get_or_fetch(pay_year, lambda: scrape_due_dates(driver))
+        blocks.append("\nDue Dates:\n" + tax_due_dates_text)
+
+
+def scrape_due_dates(driver):
+    driver.get(DUE_DATES_URL)
+    text = wait_for_stable_text(driver, (By.XPATH, "(//ul)[2]"), "due-dates", timeout=20)
+    record_page_weight(driver, step_tracer.current() or {})
+    return text
+
+
+def scrape_detail_script(driver, generated_url, blocks):
+    # ------------------------------
+    # STEP 7: Navigate to URL
+    # ------------------------------
+    with step_tracer.step("step7", driver) as span:
+        driver.get(generated_url)
+        record_page_weight(driver, span)
+
+
+    # ------------------------------
+    # STEP 8-11: All four sections from one script call, after one wait
+    # ------------------------------
+    with step_tracer.step("step8-11", driver):
+        texts = read_stable_sections(driver, [section_id for section_id, _ in DETAIL_SECTIONS], timeout=20)
+        missing = [section_id for section_id, text in texts.items() if text is None]
+        if missing:
+            raise TimeoutException(f"Sections did not load in time: {', '.join(missing)}")
+        blocks.extend(section_blocks(texts))
+        log.info("Sections read in one script call.")
+
+
+def scrape_detail_sections(driver, generated_url, blocks):
+    # ------------------------------
+    # STEP 7: Navigate to URL
+    # ------------------------------
+    with step_tracer.step("step7", driver) as span:
         driver.get(generated_url)
-        WebDriverWait(driver, 30).until(EC.presence_of_element_located((By.ID, "parcel")))
-        time.sleep(3)
-        ("Navigated and loaded successfully.")
+        wait_for_stable_text(driver, (By.ID, "parcel"), "parcel", timeout=30)
+        record_page_weight(driver, span)
+        log.info("Navigated and loaded successfully.")
 
 
-        # ------------------------------
-        # STEP 8: Property Info
-        # ------------------------------
-        info_element = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "info"))
-        )
-        property_info_text = info_element.text.strip()
-        log_to_file("\nProperty Information:\n" + property_info_text)
+    # ------------------------------
+    # STEP 8: Property Info
+    # ------------------------------
+    with step_tracer.step("step8", driver):
+        property_info_text = wait_for_stable_text(driver, (By.ID, "info"), "info", timeout=20)
+        blocks.append("\nProperty Information:\n" + property_info_text)
 
 
-        # ------------------------------
-        # STEP 9: Tax Info
-        # ------------------------------
-        billing_element = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "billing-detail"))
-        )
-        tax_info_text = billing_element.text.strip()
-        log_to_file("\nTax Information:\n" + tax_info_text)
+    # ------------------------------
+    # STEP 9: Tax Info
+    # ------------------------------
+    with step_tracer.step("step9", driver):
+        tax_info_text = wait_for_stable_text(driver, (By.ID, "billing-detail"), "billing-detail", timeout=20)
+        blocks.append("\nTax Information:\n" + tax_info_text)
 
 
-        # ------------------------------
-        # STEP 10: Payment History
-        # ------------------------------
-        payment_history_element = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "payment-history"))
-        )
-        payment_history_text = payment_history_element.text.strip()
-        log_to_file("\nPayment History:\n" + payment_history_text)
+    # ------------------------------
+    # STEP 10: Payment History
+    # ------------------------------
+    with step_tracer.step("step10", driver):
+        payment_history_text = wait_for_stable_text(driver, (By.ID, "payment-history"), "payment-history", timeout=20)
+        blocks.append("\nPayment History:\n" + payment_history_text)
 
 
-        # ------------------------------
-        # STEP 11: Tax History
-        # ------------------------------
-        tax_history_element = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.ID, "tax-history"))
-        )
-        tax_history_text = tax_history_element.text.strip()
-        log_to_file("\nTax History:\n" + tax_history_text)
-
+    # ------------------------------
+    # STEP 11: Tax History
+    # ------------------------------
+    with step_tracer.step("step11", driver):
+        tax_history_text = wait_for_stable_text(driver, (By.ID, "tax-history"), "tax-history", timeout=20)
+        blocks.append("\nTax History:\n" + tax_history_text)
 
-        # ------------------------------
-        # STEP 12: Due Dates (Indy)
-        # ------------------------------
-        indy_url = "https://www.indy.gov/activity/find-property-tax-due-dates"
-        driver.get(indy_url)
-        ul_element = WebDriverWait(driver, 20).until(
-            EC.presence_of_element_located((By.XPATH, "(//ul)[2]"))
-        )
-        tax_due_dates_text = ul_element.text.strip()
-        log_to_file("\nDue Dates:\n" + tax_due_dates_text)
 
-
-    except Exception as e:
-        log_to_file(f"Error in record {idx}: {e}")
+# ============================================
+# Process Each Record
+# ============================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape raw text for every address in the list.")
+    parser.add_argument("--resume", action="store_true", help="skip records finished by an earlier run and continue its output")
+    parser.add_argument("--browser-profile", choices=BROWSER_PROFILES, default=browser_profile)
+    parser.add_argument("--max-uses", type=int, default=200, help="restart the browser after this many records")
+    args = parser.parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+    use_browser_profile(args.browser_profile)
+
+    done = open_checkpoint(args.resume)
+    # One session, reset between records (cookies cleared, blank page), restarted every --max-uses or when it failed
+    driver_pool = DriverPool(new_driver, size=1, max_uses=args.max_uses)
+    try:
+        for idx, (partial_address, partial_name) in enumerate(zip(addresses, names), start=1):
+            key = record_key(idx, partial_address, partial_name)
+            if key in done:
+                continue
+            write_record(scrape_record(driver_pool, idx, partial_address, partial_name), key)
     finally:
-        driver.quit()
-        log_to_file("\n==========================================================================================\n")
+        driver_pool.close()
+        raw_text_sink.close()
+        checkpoint_journal.close()
 
 
-print(" All records processed. Output saved in allen.rawtext.txt")
+    print(f" All records processed. Output saved in {output_file}")
+    print(f" Section readiness timings: {readiness_timings.summary()}")
+    print(f" Duplicate index: {duplicate_index.stats()}")
+    step_tracer.dump(step_trace_file)
+    step_tracer.print_summary()
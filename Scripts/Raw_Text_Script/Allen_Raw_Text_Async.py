@@ -0,0 +1,159 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import Allen_Raw_Text as raw_text
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.checkpoint import record_key
+from common.due_dates import DUE_DATES_URL, due_date_cache, pay_year_from_text
+from common.rate_limit import HostLimits
+from common.readiness import readiness_timings
+from common.session_pool import DriverPool
+from common.tracing import step_tracer
+
+
+# ============================================
+# Per-host limits: (concurrent records, entries per second, burst)
+# ============================================
+DEFAULT_HOST_LIMITS = {
+    "lowtaxinfo.com": (2, 1.0, 2),
+    "indy.gov": (1, 0.2, 1),
+}
+
+
+# ============================================
+# One record, stage by stage
+# ============================================
+async def run_with_driver(drivers, record_id, func, *args):
+    """Run a blocking Selenium stage in a worker thread on a pooled browser"""
+    def call():
+        with drivers.session() as driver, step_tracer.record(record_id):
+            return func(driver, *args)
+    return await asyncio.to_thread(call)
+
+
+async def scrape_record_async(idx, partial_address, partial_name, drivers, limits):
+    """Same blocks as scrape_record, but each site is entered under its own host limit"""
+    header = raw_text.record_header(idx, partial_address)
+    print(header)
+    blocks = [header]
+    try:
+        # Steps 1-11 all talk to lowtaxinfo
+        async with limits.for_url(raw_text.county_site_url):
+            found = await run_with_driver(drivers, idx, raw_text.scrape_detail, partial_address, partial_name, blocks)
+
+        if found:
+            # Step 12 only reaches indy.gov when the pay year is not cached yet; a cached
+            # text is passed through so an expiry in between never needs a driver here
+            tax_due_dates_text = due_date_cache.get(pay_year_from_text("\n".join(blocks)))
+            if tax_due_dates_text is not None:
+                with step_tracer.record(idx):
+                    raw_text.append_due_dates(None, blocks, tax_due_dates_text)
+            else:
+                async with limits.for_url(DUE_DATES_URL):
+                    await run_with_driver(drivers, idx, raw_text.append_due_dates, blocks)
+    except Exception as e:
+        blocks.append(f"Error in record {idx}: {e}")
+    blocks.append(raw_text.RECORD_SEPARATOR)
+    return blocks
+
+
+# ============================================
+# Orchestrator
+# ============================================
+async def run_async(addresses, names, in_flight=4, max_uses=200, host_limits=None, resume=False):
+    """
+    Keep up to in_flight records moving at once; while one waits on a page load the
+    next search starts. Records are still written in input order, one append each.
+    """
+    done = raw_text.open_checkpoint(resume)
+    jobs = [
+        (idx, partial_address, partial_name)
+        for idx, (partial_address, partial_name) in enumerate(zip(addresses, names), start=1)
+        if record_key(idx, partial_address, partial_name) not in done
+    ]
+
+    asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=in_flight))
+    drivers = DriverPool(raw_text.new_driver, size=in_flight, max_uses=max_uses)
+    limits = HostLimits(host_limits or DEFAULT_HOST_LIMITS)
+    gate = asyncio.Semaphore(in_flight)
+    started = time.perf_counter()
+    written = 0
+
+    async def bounded(idx, partial_address, partial_name):
+        async with gate:
+            return await scrape_record_async(idx, partial_address, partial_name, drivers, limits)
+
+    async def write_next(pending):
+        nonlocal written
+        (idx, partial_address, partial_name), task = pending.popleft()
+        raw_text.write_record(await task, record_key(idx, partial_address, partial_name))
+        written += 1
+
+    pending = deque()
+    try:
+        for job in jobs:
+            pending.append((job, asyncio.create_task(bounded(*job))))
+            # A small window ahead of the writer keeps memory flat on long lists
+            while len(pending) >= in_flight * 2:
+                await write_next(pending)
+        while pending:
+            await write_next(pending)
+    finally:
+        for _, task in pending:
+            task.cancel()
+        drivers.close()
+        raw_text.raw_text_sink.close()
+        raw_text.checkpoint_journal.close()
+
+    return {
+        "records": written,
+        "seconds": time.perf_counter() - started,
+        "hosts": limits.stats(),
+        "drivers": drivers.stats(),
+    }
+
+
+def print_stats(stats):
+    per_minute = stats["records"] / stats["seconds"] * 60 if stats["seconds"] else 0.0
+    print(f"\n{stats['records']} records in {stats['seconds']:.1f}s ({per_minute:.1f} records/min)")
+    for host, host_stats in stats["hosts"].items():
+        print(f"  {host}: {host_stats}")
+    print(f"  drivers: {stats['drivers']}")
+    print(f"Section readiness timings: {readiness_timings.summary()}")
+    step_tracer.dump(raw_text.step_trace_file)
+    step_tracer.print_summary()
+
+
+# ============================================
+# Run
+# ============================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape raw text with several records in flight and per-host limits.")
+    parser.add_argument("--in-flight", type=int, default=int(os.getenv("RAW_TEXT_IN_FLIGHT", "4")), help="records (and browsers) in flight")
+    parser.add_argument("--max-uses", type=int, default=200, help="recycle a browser after this many stages")
+    parser.add_argument("--fetch-mode", choices=["selenium", "http"], default=raw_text.fetch_mode)
+    parser.add_argument("--lowtax-concurrency", type=int, default=DEFAULT_HOST_LIMITS["lowtaxinfo.com"][0])
+    parser.add_argument("--lowtax-rate", type=float, default=DEFAULT_HOST_LIMITS["lowtaxinfo.com"][1], help="records started per second")
+    parser.add_argument("--indy-concurrency", type=int, default=DEFAULT_HOST_LIMITS["indy.gov"][0])
+    parser.add_argument("--indy-rate", type=float, default=DEFAULT_HOST_LIMITS["indy.gov"][1], help="requests per second")
+    parser.add_argument("--resume", action="store_true", help="skip records finished by an earlier run and continue its output")
+    parser.add_argument("--browser-profile", choices=raw_text.BROWSER_PROFILES, default=raw_text.browser_profile)
+    args = parser.parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+    raw_text.fetch_mode = args.fetch_mode
+    raw_text.use_browser_profile(args.browser_profile)
+
+    host_limits = {
+        "lowtaxinfo.com": (args.lowtax_concurrency, args.lowtax_rate, max(1, args.lowtax_concurrency)),
+        "indy.gov": (args.indy_concurrency, args.indy_rate, 1),
+    }
+    stats = asyncio.run(run_async(raw_text.addresses, raw_text.names, args.in_flight, args.max_uses, host_limits, args.resume))
+    print_stats(stats)
+    print(f" All records processed. Output saved in {raw_text.output_file}")
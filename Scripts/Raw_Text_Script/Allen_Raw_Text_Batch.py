@@ -0,0 +1,112 @@
+import argparse
+import logging
+import os
+import sys
+import time
+import multiprocessing
+from multiprocessing import util
+
+import Allen_Raw_Text as raw_text
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.session_pool import DriverPool
+from common.readiness import readiness_timings
+from common.checkpoint import record_key
+from common.tracing import step_tracer
+
+
+# ============================================
+# Worker process: one long-lived browser each
+# ============================================
+worker_pool = None
+
+
+def init_worker(max_uses, fetch_mode, browser_profile):
+    global worker_pool
+    raw_text.fetch_mode = fetch_mode
+    raw_text.use_browser_profile(browser_profile)
+    worker_pool = DriverPool(raw_text.new_driver, size=1, max_uses=max_uses)
+    util.Finalize(None, worker_pool.close, exitpriority=16)
+
+
+def scrape_job(job):
+    idx, partial_address, partial_name = job
+    started = time.perf_counter()
+    blocks = raw_text.scrape_record(worker_pool, idx, partial_address, partial_name)
+    return idx, os.getpid(), time.perf_counter() - started, blocks, (readiness_timings.drain(), step_tracer.drain())
+
+
+# ============================================
+# Batch runner
+# ============================================
+def run_batch(addresses, names, workers=4, max_uses=200, fetch_mode=None, resume=False):
+    """Scrape records across worker processes; only the parent writes, one record per append, in input order"""
+    done = raw_text.open_checkpoint(resume)
+    jobs = [
+        (idx, partial_address, partial_name)
+        for idx, (partial_address, partial_name) in enumerate(zip(addresses, names), start=1)
+        if record_key(idx, partial_address, partial_name) not in done
+    ]
+    keys = {idx: record_key(idx, partial_address, partial_name) for idx, partial_address, partial_name in jobs}
+    fetch_mode = fetch_mode or raw_text.fetch_mode
+    worker_stats = {}
+    started = time.perf_counter()
+
+    pool = multiprocessing.Pool(processes=workers, initializer=init_worker, initargs=(max_uses, fetch_mode, raw_text.browser_profile))
+    try:
+        # imap hands jobs out one at a time but yields results in submission order
+        for idx, pid, elapsed, blocks, (readiness_samples, step_spans) in pool.imap(scrape_job, jobs):
+            raw_text.write_record(blocks, keys[idx])
+            readiness_timings.extend(readiness_samples)
+            step_tracer.extend(step_spans)
+            stats = worker_stats.setdefault(pid, {"records": 0, "seconds": 0.0})
+            stats["records"] += 1
+            stats["seconds"] += elapsed
+        pool.close()
+    except BaseException:
+        pool.terminate()
+        raise
+    finally:
+        pool.join()
+        raw_text.raw_text_sink.close()
+        raw_text.checkpoint_journal.close()
+
+    total_seconds = time.perf_counter() - started
+    return worker_stats, total_seconds
+
+
+def print_stats(worker_stats, total_seconds):
+    total_records = sum(s["records"] for s in worker_stats.values())
+    print("\nWorker throughput:")
+    for pid, stats in sorted(worker_stats.items()):
+        per_minute = stats["records"] / stats["seconds"] * 60 if stats["seconds"] else 0.0
+        print(f"  worker {pid}: {stats['records']} records in {stats['seconds']:.1f}s ({per_minute:.1f} records/min)")
+    overall = total_records / total_seconds * 60 if total_seconds else 0.0
+    print(f"  total: {total_records} records in {total_seconds:.1f}s ({overall:.1f} records/min)")
+    print(f"Section readiness timings: {readiness_timings.summary()}")
+    step_tracer.dump(raw_text.step_trace_file)
+    step_tracer.print_summary()
+
+
+# ============================================
+# Run
+# ============================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape raw text for many records in parallel.")
+    parser.add_argument("--workers", type=int, default=int(os.getenv("RAW_TEXT_WORKERS", "4")))
+    parser.add_argument("--max-uses", type=int, default=200, help="recycle a worker's browser after this many records")
+    parser.add_argument("--fetch-mode", choices=["selenium", "http"], default=raw_text.fetch_mode)
+    parser.add_argument("--rotate-every", type=int, default=raw_text.raw_text_sink.rotate_every or 0,
+                        help="start a new numbered output file every N records (0 = single file)")
+    parser.add_argument("--resume", action="store_true", help="skip records finished by an earlier run and continue its output")
+    parser.add_argument("--browser-profile", choices=raw_text.BROWSER_PROFILES, default=raw_text.browser_profile)
+    args = parser.parse_args()
+    logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO"), format="%(asctime)s %(levelname)s %(message)s")
+    raw_text.use_browser_profile(args.browser_profile)
+    raw_text.raw_text_sink.rotate_every = args.rotate_every or None
+
+    worker_stats, total_seconds = run_batch(
+        raw_text.addresses, raw_text.names, args.workers, args.max_uses, args.fetch_mode, args.resume
+    )
+    print_stats(worker_stats, total_seconds)
+    print(f" All records processed. Output saved in {raw_text.output_file}")
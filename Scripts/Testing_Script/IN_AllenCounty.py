@@ -1,5 +1,6 @@
 import os
 import re
+import sys
 import time
 from dotenv import load_dotenv
 from datetime import datetime
@@ -12,6 +13,9 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from common.pagination import RowCache, iter_result_rows, row_matches
+
 load_dotenv()
 
 # ------------------------------
@@ -49,6 +53,7 @@ partial_address = "6201 Thimlar Rd New Haven, IN 46774"
 
 normalized_partial_name_query = normalize_string(partial_name)
 normalized_partial_address = normalize_string(partial_address)
+row_cache = RowCache()
 
 
 # ------------------------------
@@ -110,117 +115,30 @@ except Exception as e:
 
 
 # ------------------------------
-# STEP 3 & 4: Detect Pagination and Extract All Table Rows
-# ------------------------------
-try:
-    # Default to single page
-    start_page = 1
-    end_page = 1
-
-    # Try detecting pagination
-    try:
-        pagination = WebDriverWait(driver, 5).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.pagination"))
-        )
-
-        # Extract all page number elements
-        page_links = pagination.find_elements(By.CSS_SELECTOR, "li.page-item a.page-link")
-
-        page_numbers = []
-        for link in page_links:
-            text = link.text.strip()
-            if text.isdigit():
-                page_numbers.append(int(text))
-
-        if page_numbers:
-            start_page = min(page_numbers)
-            end_page = max(page_numbers)
-            ("Pagination detected: Start Page = {start_page}, End Page = {end_page}")
-        else:
-            print("Pagination not found, assuming single page result.")
-
-
-    except TimeoutException:
-        ("No pagination visible — only one page of results.")
-        start_page = 1
-        end_page = 1
-
-    # Loop through each page and extract table rows
-    for page in range(start_page, end_page + 1):
-        (f"Processing Page {page}...")
-
-        # Build URL manually if multiple pages exist
-        if end_page > 1:
-            page_url = f"https://lowtaxinfo.com/allencounty?address={partial_address.replace(' ', '%20')}&page={page}"
-            driver.get(page_url)
-
-        # Wait for table rows to load
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr"))
-        )
-
-        # Extract all rows
-        rows = driver.find_elements(By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr")
-
-        if not rows:
-            print(f"No rows found on Page {page}")
-            continue
-
-        # Print row data
-        for i, row in enumerate(rows, start=1):
-            (f"{page}.{i}. {row.text.strip()}")
-
-        (f"Completed extracting Page {page} ({len(rows)} rows)")
-
-except TimeoutException:
-    print("Table did not load properly on one of the pages.")
-except Exception as e:
-    print("Step 3 & 4 failed:", e)
-
-
-# ------------------------------
-# STEP 5: Find Matching Record
+# STEP 3-5: Scan Result Pages Once and Stop at the First Matching Record
 # ------------------------------
 try:
-    # Reuse the normalize_string function from before
     matched_found = False
 
-    # Loop through each page again
-    for page in range(start_page, end_page + 1):
-        (f"\nSearching for match in Page {page}...")
+    # Pages are loaded lazily, so every page after the match is skipped
+    for page, i, row_text in iter_result_rows(driver, county_site_url, owner_input_text, partial_address, row_cache):
+        (f"{page}.{i}. {row_text}")
 
-        # Build URL manually if multiple pages exist
-        if end_page > 1:
-            page_url = f"https://lowtaxinfo.com/allencounty?address={partial_address.replace(' ', '%20')}&page={page}"
-            driver.get(page_url)
-
-        # Wait for table rows to load
-        WebDriverWait(driver, 20).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr"))
-        )
-
-        rows = driver.find_elements(By.CSS_SELECTOR, ".table.table-sm.table-hover tbody tr")
-
-        for i, row in enumerate(rows, start=1):
-            row_text = row.text.strip()
-            normalized_row = normalize_string(row_text)
-
-            if normalized_partial_name_query in normalized_row and normalized_partial_address in normalized_row:
-                (f"\nMatched Record Found on Page {page}, Row {i}:")
-                (row_text)
-                matched_found = True
-                matched_row_text = row_text
-                break  # stop after first match
-
-        if matched_found:
-            break  # stop searching if match found
+        if row_matches(row_text, normalized_partial_name_query, normalized_partial_address):
+            (f"\nMatched Record Found on Page {page}, Row {i}:")
+            (row_text)
+            matched_found = True
+            matched_row_text = row_text
+            break  # stop after first match
 
     if not matched_found:
         print("No matching record found in any page.")
 
 
+except TimeoutException:
+    print("Table did not load properly on one of the pages.")
 except Exception as e:
-    print("Step 5 failed:", e)
+    print("Step 3-5 failed:", e)
 
 
 # ------------------------------
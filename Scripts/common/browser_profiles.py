@@ -0,0 +1,83 @@
+import copy
+import os
+
+
+# ------------------------------
+# Browser profiles
+# ------------------------------
+# "default" is the browser as the scripts always started it. "lean" runs headless,
+# returns from driver.get() at DOMContentLoaded and blocks what the scrapers never
+# read; every section is still waited for explicitly, so the text is the same.
+BROWSER_PROFILES = ("default", "lean")
+
+browser_profile = os.getenv("BROWSER_PROFILE", "default")
+
+# Images, fonts, media and third-party analytics. Stylesheets are kept: .text only
+# returns visible text, and without CSS hidden elements would start to show.
+LEAN_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.bmp",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*hotjar.com*", "*nr-data.net*", "*newrelic.com*",
+    "*siteimproveanalytics.com*", "*clarity.ms*", "*youtube.com*",
+]
+
+# Extra per-page counters for the step trace; one more script call per page
+track_page_weight = os.getenv("TRACK_PAGE_WEIGHT", "0") == "1"
+
+
+def check_profile(profile):
+    if profile not in BROWSER_PROFILES:
+        raise ValueError(f"Unknown browser profile {profile!r}, expected one of {BROWSER_PROFILES}")
+    return profile
+
+
+def profile_options(options, profile=None):
+    """A copy of the base Chrome options with the profile's launch settings added."""
+    profile = check_profile(profile or browser_profile)
+    options = copy.deepcopy(options)
+    if profile == "lean":
+        options.add_argument("--headless=new")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--disable-extensions")
+        options.page_load_strategy = "eager"
+    return options
+
+
+def apply_profile(driver, profile=None):
+    """
+    Settings that can be changed on a running browser: request blocking over CDP.
+    Launch settings (headless, page load strategy) need profile_options instead.
+    """
+    profile = check_profile(profile or browser_profile)
+    if profile == "lean" and hasattr(driver, "execute_cdp_cmd"):
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS})
+    driver._browser_profile = profile
+    return driver
+
+
+# ------------------------------
+# Page weight from the Performance API
+# ------------------------------
+PAGE_WEIGHT_SCRIPT = """
+const entries = performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'));
+return [entries.length, entries.reduce((total, entry) => total + (entry.transferSize || 0), 0)];
+"""
+
+
+def page_weight(driver):
+    """{'requests': n, 'bytes': transferred} for the page currently loaded."""
+    requests, transferred = driver.execute_script(PAGE_WEIGHT_SCRIPT)
+    return {"requests": requests, "bytes": transferred}
+
+
+def record_page_weight(driver, span):
+    """Add the current page's weight to a trace span when TRACK_PAGE_WEIGHT=1."""
+    if not track_page_weight:
+        return
+    try:
+        span.update(page_weight(driver))
+    except Exception:
+        pass
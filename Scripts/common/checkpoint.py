@@ -0,0 +1,106 @@
+import json
+import os
+
+
+# ------------------------------
+# Checkpoint journal for long scraping runs
+# ------------------------------
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of finished records and where their blocks landed
+    in the output. Each line goes out in one write followed by fsync, so after a
+    crash the journal holds every finished record and at most one torn last line,
+    which load() drops.
+
+    The first line of a run is {"begin": {"file", "offset"}}: where the output
+    stood before the run wrote anything.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.begin = None
+        self.entries = []
+        self._fd = None
+
+    def load(self):
+        """Read the journal back, cutting off a half-written last line."""
+        self.begin = None
+        self.entries = []
+        valid_bytes = 0
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        item = json.loads(line)
+                    except json.JSONDecodeError:
+                        break
+                    if "begin" in item:
+                        self.begin = item["begin"]
+                    else:
+                        self.entries.append(item)
+                    valid_bytes += len(line)
+        except FileNotFoundError:
+            return self
+        if valid_bytes != os.path.getsize(self.path):
+            os.truncate(self.path, valid_bytes)
+        return self
+
+    def done_keys(self):
+        return {entry["key"] for entry in self.entries}
+
+    def last_position(self):
+        """(file, offset) the output should be cut back to before resuming, or None."""
+        if self.entries:
+            return self.entries[-1]["file"], self.entries[-1]["end"]
+        if self.begin:
+            return self.begin["file"], self.begin["offset"]
+        return None
+
+    def start(self, output_path):
+        """Begin a fresh run: empty the journal and note where the output file stands."""
+        self.close()
+        self.entries = []
+        try:
+            offset = os.path.getsize(output_path)
+        except FileNotFoundError:
+            offset = 0
+        self.begin = {"file": output_path, "offset": offset}
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"begin": self.begin}) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def record(self, key, location):
+        """Journal one finished record; location is RawTextSink.end_record()'s (file, start, end)."""
+        file_path, start, end = location
+        entry = {"key": key, "file": file_path, "start": start, "end": end}
+        if self._fd is None:
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644)
+        os.write(self._fd, (json.dumps(entry) + "\n").encode("utf-8"))
+        os.fsync(self._fd)
+        self.entries.append(entry)
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def record_key(idx, partial_address, partial_name):
+    return f"{idx}|{partial_address}|{partial_name}"
+
+
+def resume_sink(journal, sink):
+    """
+    Cut the output back to the last journaled record and let the sink carry on from there.
+    With no journal to resume from, start one here: without its begin line a crash in
+    the first record could not be cut back on the next resume.
+    """
+    position = journal.last_position()
+    if position is None:
+        journal.start(sink.current_path())
+        return
+    file_path, offset = position
+    sink.rewind(len(journal.entries), file_path, offset)
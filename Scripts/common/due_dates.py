@@ -0,0 +1,94 @@
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+
+from common.fileutil import atomic_write_text, file_lock
+
+
+DUE_DATES_URL = os.getenv("DUE_DATES_URL", "https://www.indy.gov/activity/find-property-tax-due-dates")
+PAY_YEAR_RE = re.compile(r"Tax Year/Pay Year\s*\n\s*\d{4}\s*/\s*(\d{4})")
+
+
+def pay_year_from_text(raw_text):
+    """Pay year from the 'Tax Year/Pay Year' line of the property info, else the current year."""
+    match = PAY_YEAR_RE.search(raw_text)
+    return match.group(1) if match else str(datetime.now().year)
+
+
+# ------------------------------
+# Due dates cached per pay year
+# ------------------------------
+class DueDateCache:
+    """
+    Step 12 text keyed by pay year, kept in memory and in a JSON file on disk.
+    Workers share the file; a lock makes sure only one of them scrapes indy.gov.
+    """
+
+    def __init__(self, path, ttl_seconds=30 * 24 * 3600):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._memory = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, pay_year):
+        pay_year = str(pay_year)
+        with self._lock:
+            entry = self._memory.get(pay_year)
+        if entry is None or not self._fresh(entry):
+            entry = self._read_disk().get(pay_year)
+            if entry is None or not self._fresh(entry):
+                return None
+            with self._lock:
+                self._memory[pay_year] = entry
+        return entry["text"]
+
+    def get_or_fetch(self, pay_year, fetch):
+        """Cached text for pay_year; on a miss call fetch() once across all processes."""
+        text = self.get(pay_year)
+        if text is not None:
+            self.hits += 1
+            return text
+
+        with file_lock(self.path):
+            # Another worker may have filled it while we waited for the lock
+            entry = self._read_disk().get(str(pay_year))
+            if entry is not None and self._fresh(entry):
+                self.hits += 1
+                with self._lock:
+                    self._memory[str(pay_year)] = entry
+                return entry["text"]
+
+            self.misses += 1
+            text = fetch()
+            self._store(str(pay_year), text)
+            return text
+
+    def _store(self, pay_year, text):
+        """Merge one entry into the file; caller holds the file lock."""
+        entry = {"text": text, "fetched_at": time.time()}
+        entries = self._read_disk()
+        entries[pay_year] = entry
+        atomic_write_text(self.path, json.dumps(entries, indent=2))
+        with self._lock:
+            self._memory[pay_year] = entry
+
+    def _fresh(self, entry):
+        return time.time() - entry.get("fetched_at", 0) < self.ttl_seconds
+
+    def _read_disk(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+
+due_date_cache = DueDateCache(
+    os.getenv("DUE_DATES_CACHE", "due_dates_cache.json"),
+    ttl_seconds=int(os.getenv("DUE_DATES_TTL_SECONDS", str(30 * 24 * 3600))),
+)
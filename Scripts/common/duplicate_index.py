@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import threading
+import time
+
+from common.pagination import normalize_string
+
+
+# ------------------------------
+# Address + owner -> Duplicate# index
+# ------------------------------
+class DuplicateIndex:
+    """
+    Duplicate numbers found by earlier searches, keyed by county site plus the
+    normalized address and owner. A parcel's Duplicate# does not change from year
+    to year, so a hit lets the scraper go straight to the detail URL.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    @staticmethod
+    def key(site_url, address, owner):
+        return site_url.rstrip("/").lower(), normalize_string(address), normalize_string(owner)
+
+    def get(self, site_url, address, owner):
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT duplicate FROM duplicates WHERE site = ? AND address = ? AND owner = ?",
+                self.key(site_url, address, owner),
+            ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def put(self, site_url, address, owner, duplicate):
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO duplicates (site, address, owner, duplicate, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    self.key(site_url, address, owner) + (str(duplicate), time.time()),
+                )
+
+    def forget(self, site_url, address, owner):
+        """Drop an entry whose detail page no longer loads, so the next run searches again."""
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(
+                    "DELETE FROM duplicates WHERE site = ? AND address = ? AND owner = ?",
+                    self.key(site_url, address, owner),
+                )
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None and self._conn_pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+    def _connect(self):
+        # One connection per process; batch workers each open their own
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS duplicates ("
+                    "site TEXT NOT NULL, address TEXT NOT NULL, owner TEXT NOT NULL, "
+                    "duplicate TEXT NOT NULL, updated_at REAL NOT NULL, "
+                    "PRIMARY KEY (site, address, owner))"
+                )
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
+
+
+duplicate_index = DuplicateIndex(os.getenv("DUPLICATE_INDEX", "duplicate_index.sqlite3"))
@@ -0,0 +1,156 @@
+import re
+import threading
+from html.parser import HTMLParser
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+# ------------------------------
+# Detail page sections (Steps 8-11)
+# ------------------------------
+DETAIL_SECTIONS = [
+    ("info", "Property Information"),
+    ("billing-detail", "Tax Information"),
+    ("payment-history", "Payment History"),
+    ("tax-history", "Tax History"),
+]
+
+BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "caption", "dd", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+    "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "table", "tbody",
+    "tfoot", "thead", "tr", "ul",
+}
+CELL_TAGS = {"td", "th"}
+SKIP_TAGS = {"head", "noscript", "script", "style", "template", "title"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+WHITESPACE_RE = re.compile(r"[ \t\n\r\f]+")
+HIDDEN_STYLE_RE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+
+_local = threading.local()
+
+
+# ------------------------------
+# Pooled keep-alive HTTP session
+# ------------------------------
+def http_session(pool_size=10):
+    """One keep-alive session per thread so workers reuse their TCP/TLS connections."""
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers["User-Agent"] = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 Chrome/124.0 Safari/537.36"
+        _local.session = session
+    return session
+
+
+# ------------------------------
+# HTML -> visible text, WebDriver style
+# ------------------------------
+class SectionTextParser(HTMLParser):
+    """Collect the visible text of the elements whose id is in section_ids."""
+
+    def __init__(self, section_ids):
+        super().__init__(convert_charrefs=True)
+        self.section_ids = set(section_ids)
+        self.parts = {}
+        self._stack = []      # (tag, section_id or None, hidden)
+        self._hidden_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        section_id = attrs.get("id") if attrs.get("id") in self.section_ids else None
+        hidden = (
+            tag in SKIP_TAGS
+            or "hidden" in attrs
+            or bool(HIDDEN_STYLE_RE.search(attrs.get("style") or ""))
+        )
+
+        if section_id is not None:
+            self.parts[section_id] = []
+        self._break(tag)
+
+        if tag in VOID_TAGS:
+            return
+        self._stack.append((tag, section_id, hidden))
+        if hidden:
+            self._hidden_depth += 1
+
+    def handle_startendtag(self, tag, attrs):
+        self._break(tag)
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS:
+            return
+        # Tolerate unclosed tags: pop back to the matching opener
+        for pos in range(len(self._stack) - 1, -1, -1):
+            if self._stack[pos][0] == tag:
+                for _, _, hidden in self._stack[pos:]:
+                    if hidden:
+                        self._hidden_depth -= 1
+                del self._stack[pos:]
+                break
+        self._break(tag)
+
+    def handle_data(self, data):
+        if self._hidden_depth:
+            return
+        for target in self._open_sections():
+            target.append(data)
+
+    def _break(self, tag):
+        if self._hidden_depth:
+            return
+        marker = "\n" if tag in BLOCK_TAGS else " " if tag in CELL_TAGS else None
+        if marker:
+            for target in self._open_sections():
+                target.append(marker)
+
+    def _open_sections(self):
+        return [self.parts[sid] for _, sid, _ in self._stack if sid is not None]
+
+
+def visible_text(fragments):
+    """Collapse whitespace like WebDriver's element.text: trim lines, drop empties, keep &nbsp;."""
+    lines = []
+    for line in "".join(fragments).split("\n"):
+        line = WHITESPACE_RE.sub(" ", line).strip(" ").replace("\xa0", " ")
+        if line.strip():
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def parse_detail_sections(html):
+    """Return {section_id: text} or None when any section is missing/empty (JS-rendered page)."""
+    parser = SectionTextParser([section_id for section_id, _ in DETAIL_SECTIONS])
+    parser.feed(html)
+    parser.close()
+
+    sections = {}
+    for section_id, _ in DETAIL_SECTIONS:
+        if section_id not in parser.parts:
+            return None
+        text = visible_text(parser.parts[section_id])
+        if not text:
+            return None
+        sections[section_id] = text
+    return sections
+
+
+def fetch_detail_sections(url, timeout=15):
+    """Fetch a lowtaxinfo detail page over HTTP; None means fall back to Selenium."""
+    try:
+        response = http_session().get(url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException:
+        return None
+    return parse_detail_sections(response.text)
+
+
+def section_blocks(sections):
+    """Raw-text blocks for Steps 8-11, in the same form the Selenium steps write them."""
+    return [f"\n{title}:\n{sections[section_id]}" for section_id, title in DETAIL_SECTIONS]
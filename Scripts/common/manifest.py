@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+
+from common.fileutil import atomic_open, atomic_write_text
+
+
+def content_hash(*parts):
+    """sha256 over the given strings, kept apart so ('ab', 'c') and ('a', 'bc') differ."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8")
+        digest.update(str(len(data)).encode("ascii") + b":" + data)
+    return digest.hexdigest()
+
+
+# ------------------------------
+# Content-hash manifest per output file
+# ------------------------------
+class Manifest:
+    """
+    {record key: content hash} for everything already written to an output file.
+    A record whose hash is unchanged can be skipped on the next run. The manifest
+    is only trusted while the file it describes still exists.
+    """
+
+    def __init__(self, path, target_path=None):
+        self.path = path
+        self.entries = {}
+        self.updated = 0
+        if target_path is None or os.path.exists(target_path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self.entries = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                self.entries = {}
+
+    def unchanged(self, key, digest):
+        return self.entries.get(key) == digest
+
+    def update(self, key, digest):
+        self.entries[key] = digest
+        self.updated += 1
+
+    def save(self):
+        atomic_write_text(self.path, json.dumps(self.entries, indent=0, sort_keys=True))
+
+
+def manifest_path(target_path):
+    return target_path + ".manifest.json"
+
+
+# ------------------------------
+# Merge changed lines into a JSONL file
+# ------------------------------
+def merge_jsonl(path, updates, key_func):
+    """
+    Rewrite the JSONL file at path with updates ({key: line}) applied: lines whose
+    key is in updates are replaced in place, the rest are kept, and new keys are
+    appended in the order given. Streams the old file; the swap is atomic.
+    Returns (replaced, appended).
+    """
+    updates = dict(updates)
+    if not updates and os.path.exists(path):
+        return 0, 0
+    replaced = 0
+    with atomic_open(path) as out:
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    key = key_func(json.loads(line))
+                    if key in updates:
+                        out.write(updates.pop(key) + "\n")
+                        replaced += 1
+                    else:
+                        out.write(line if line.endswith("\n") else line + "\n")
+        for line in updates.values():
+            out.write(line + "\n")
+    return replaced, len(updates)
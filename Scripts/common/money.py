@@ -0,0 +1,53 @@
+import re
+
+try:
+    import numpy as np
+except ImportError:  # numpy is only needed for the batch array helpers
+    np = None
+
+
+# ------------------------------
+# Currency tokens as integer cents
+# ------------------------------
+MONEY_RE = re.compile(r"\$(-?\d+(?:,\d{3})*)(?:\.(\d{1,2}))?")
+
+
+def parse_cents(token):
+    """'$1,234.56' -> 123456. Raises ValueError when the token is not a currency amount."""
+    match = MONEY_RE.fullmatch(token.strip())
+    if not match:
+        raise ValueError(f"Not a currency amount: {token!r}")
+    dollars, cents = match.groups()
+    return int(dollars.replace(",", "") + (cents or "").ljust(2, "0"))
+
+
+def parse_amounts(text):
+    """Every currency token in text, in order, as integer cents (one regex pass)."""
+    return [int(dollars.replace(",", "") + cents.ljust(2, "0")) for dollars, cents in MONEY_RE.findall(text)]
+
+
+def format_cents(cents):
+    """123456 -> '$1,234.56', same layout as the old f'${value:,.2f}'."""
+    sign = "-" if cents < 0 else ""
+    dollars, cents = divmod(abs(cents), 100)
+    return f"${sign}{dollars:,}.{cents:02d}"
+
+
+def split_installments(cents):
+    """
+    Split a total into (first, second) installments that add back up to it exactly;
+    an odd cent goes to the first. The old round(total / 2, 2) on floats gave both
+    installments the same rounded half, so for odd totals they missed the total by a cent.
+    """
+    second = cents // 2
+    return cents - second, second
+
+
+# ------------------------------
+# Batch helpers
+# ------------------------------
+def amounts_array(text):
+    """NumPy int64 array of the cents in text, for bulk aggregation across records."""
+    if np is None:
+        raise ImportError("numpy is required for amounts_array(); pip install numpy")
+    return np.array(parse_amounts(text), dtype=np.int64)
@@ -0,0 +1,108 @@
+import re
+import threading
+from collections import OrderedDict
+
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+
+
+ROW_SELECTOR = ".table.table-sm.table-hover tbody tr"
+
+
+# ------------------------------
+# Rows already read in this browser session
+# ------------------------------
+class RowCache:
+    """Row texts per (search, page); a page that was read once is never loaded again."""
+
+    def __init__(self, max_pages=512):
+        self.max_pages = max_pages
+        self._pages = OrderedDict()
+        self._page_ranges = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            rows = self._pages.get(key)
+            if rows is not None:
+                self._pages.move_to_end(key)
+            return rows
+
+    def put(self, key, rows):
+        with self._lock:
+            self._pages[key] = rows
+            self._pages.move_to_end(key)
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+
+    def get_page_range(self, search_key):
+        return self._page_ranges.get(search_key)
+
+    def put_page_range(self, search_key, page_range):
+        self._page_ranges[search_key] = page_range
+
+
+# ------------------------------
+# Pagination helpers
+# ------------------------------
+def detect_page_range(driver, timeout=5):
+    """Return (start_page, end_page) from the pagination bar, (1, 1) if there is none."""
+    try:
+        pagination = WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "ul.pagination"))
+        )
+    except TimeoutException:
+        return 1, 1
+
+    page_links = pagination.find_elements(By.CSS_SELECTOR, "li.page-item a.page-link")
+    page_numbers = [int(link.text.strip()) for link in page_links if link.text.strip().isdigit()]
+    if not page_numbers:
+        return 1, 1
+    return min(page_numbers), max(page_numbers)
+
+
+def page_url(county_site_url, search_value, page):
+    return f"{county_site_url}?address={search_value.replace(' ', '%20')}&page={page}"
+
+
+def iter_result_rows(driver, county_site_url, owner_input_text, search_value, cache=None):
+    """
+    Yield (page, row_number, row_text) for the search results, one page at a time.
+    Pages are only loaded when the consumer asks for their rows, so breaking out of
+    the loop on a match skips every later page.
+    """
+    cache = cache if cache is not None else RowCache()
+    search_key = (county_site_url, owner_input_text, search_value)
+
+    page_range = cache.get_page_range(search_key)
+    if page_range is None:
+        page_range = detect_page_range(driver)
+        cache.put_page_range(search_key, page_range)
+    start_page, end_page = page_range
+
+    for page in range(start_page, end_page + 1):
+        rows = cache.get(search_key + (page,))
+        if rows is None:
+            # Multi-page results are addressed by URL; a single page is already on screen
+            if end_page > 1:
+                driver.get(page_url(county_site_url, search_value, page))
+
+            WebDriverWait(driver, 20).until(
+                EC.presence_of_all_elements_located((By.CSS_SELECTOR, ROW_SELECTOR))
+            )
+            rows = [row.text.strip() for row in driver.find_elements(By.CSS_SELECTOR, ROW_SELECTOR)]
+            cache.put(search_key + (page,), rows)
+
+        for i, row_text in enumerate(rows, start=1):
+            yield page, i, row_text
+
+
+def normalize_string(s):
+    return re.sub(r'[^a-zA-Z0-9]', '', s).lower()
+
+
+def row_matches(row_text, normalized_name, normalized_address):
+    normalized_row = normalize_string(row_text)
+    return normalized_name in normalized_row and normalized_address in normalized_row
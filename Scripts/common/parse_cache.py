@@ -0,0 +1,98 @@
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+
+from common.manifest import content_hash
+
+
+def normalize_raw_text(raw_text):
+    """Line endings and trailing spaces differ between scrapes without changing the parse."""
+    return "\n".join(line.rstrip() for line in raw_text.strip().splitlines())
+
+
+# ------------------------------
+# Parsed-record cache: memory LRU in front of SQLite
+# ------------------------------
+class ParseCache:
+    """
+    Parsed records keyed by sha256(parser version + normalized raw text).
+    Entries from other parser versions are never returned and are dropped when
+    the store is opened. The connection is opened lazily and reopened after a
+    fork, so every worker process gets its own.
+    """
+
+    def __init__(self, path, version, max_memory=4096):
+        self.path = path
+        self.version = str(version)
+        self.max_memory = max_memory
+        self.hits = 0
+        self.misses = 0
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        self._conn_pid = None
+
+    def key(self, raw_text):
+        return content_hash(self.version, normalize_raw_text(raw_text))
+
+    def get(self, key):
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+        if value is None:
+            row = self._connect().execute("SELECT value FROM parsed WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value = row[0]
+            self._remember(key, value)
+        self.hits += 1
+        return json.loads(value)
+
+    def put(self, key, parsed):
+        value = json.dumps(parsed, ensure_ascii=False, separators=(",", ":"))
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO parsed (key, version, value) VALUES (?, ?, ?)",
+                (key, self.version, value),
+            )
+        self._remember(key, value)
+
+    def get_or_parse(self, raw_text, parse):
+        """Cached parse of raw_text; on a miss call parse(raw_text) and store the result."""
+        key = self.key(raw_text)
+        parsed = self.get(key)
+        if parsed is None:
+            parsed = parse(raw_text)
+            self.put(key, parsed)
+        return parsed
+
+    def close(self):
+        if self._conn is not None and self._conn_pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+    def _remember(self, key, value):
+        with self._lock:
+            self._memory[key] = value
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_memory:
+                self._memory.popitem(last=False)
+
+    def _connect(self):
+        if self._conn is None or self._conn_pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            with conn:
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS parsed (key TEXT PRIMARY KEY, version TEXT NOT NULL, value TEXT NOT NULL)"
+                )
+                conn.execute("DELETE FROM parsed WHERE version != ?", (self.version,))
+            self._conn = conn
+            self._conn_pid = os.getpid()
+        return self._conn
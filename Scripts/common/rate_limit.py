@@ -0,0 +1,94 @@
+import asyncio
+import time
+from urllib.parse import urlsplit
+
+
+def host_of(url):
+    """'https://www.indy.gov/x' -> 'indy.gov', so limits are shared across subdomains."""
+    host = (urlsplit(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+# ------------------------------
+# Async token bucket
+# ------------------------------
+class TokenBucket:
+    """Allows `rate` entries per second on average with bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def take(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# ------------------------------
+# Per-host concurrency cap + rate limit
+# ------------------------------
+class HostLimiter:
+    """`async with limiter:` waits for a free slot on the host and then for a token."""
+
+    def __init__(self, concurrency, rate, burst=1):
+        self.concurrency = concurrency
+        self._slots = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate, burst)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.entered = 0
+        self.waited_seconds = 0.0
+
+    async def __aenter__(self):
+        started = time.monotonic()
+        await self._slots.acquire()
+        try:
+            await self._bucket.take()
+        except BaseException:
+            self._slots.release()
+            raise
+        self.waited_seconds += time.monotonic() - started
+        self.entered += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.in_flight -= 1
+        self._slots.release()
+
+    def stats(self):
+        return {
+            "concurrency": self.concurrency,
+            "entered": self.entered,
+            "peak_in_flight": self.peak_in_flight,
+            "waited_seconds": round(self.waited_seconds, 3),
+        }
+
+
+class HostLimits:
+    """One HostLimiter per host, created from {host: (concurrency, rate, burst)}."""
+
+    def __init__(self, settings, default=(1, 1.0, 1)):
+        self.settings = dict(settings)
+        self.default = default
+        self._limiters = {}
+
+    def for_url(self, url):
+        host = host_of(url)
+        if host not in self._limiters:
+            self._limiters[host] = HostLimiter(*self.settings.get(host, self.default))
+        return self._limiters[host]
+
+    def stats(self):
+        return {host: limiter.stats() for host, limiter in self._limiters.items()}
@@ -0,0 +1,50 @@
+import re
+
+
+# ------------------------------
+# Record markers in the raw text file
+# ------------------------------
+RECORD_START = "Property Information:"
+RECORD_END_RE = re.compile(r"^(={20,}|-{20,})$")  # record separator or the next record's header rule
+DUE_DATES_HEADER = "Due Dates:"
+PARCEL_NUMBER_RE = re.compile(r"Parcel Number\s*\n([^\n]+)")
+
+
+def iter_raw_records(path):
+    """Yield one raw record at a time: from its 'Property Information:' line up to the record separator."""
+    record_lines = None
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped == RECORD_START:
+                if record_lines:
+                    yield "".join(record_lines).rstrip()
+                record_lines = [line]
+            elif record_lines is not None and RECORD_END_RE.match(stripped):
+                yield "".join(record_lines).rstrip()
+                record_lines = None
+            elif record_lines is not None:
+                record_lines.append(line)
+    if record_lines:
+        yield "".join(record_lines).rstrip()
+
+
+def dataset_input_text(raw_record):
+    """The part of a record the dataset uses: after 'Property Information:', up to 'Due Dates:'."""
+    end = raw_record.find(DUE_DATES_HEADER)
+    return raw_record[len(RECORD_START):end if end != -1 else len(raw_record)]
+
+
+def parcel_number(text):
+    """Parcel number from the Property Information lines, '' if there is none."""
+    match = PARCEL_NUMBER_RE.search(text)
+    return match.group(1).strip() if match else ""
+
+
+def output_parcel_number(output):
+    """Parcel number of a parsed {"parcels": [...]} record (older files spell it 'ParcelNumber')."""
+    try:
+        parcel = output["parcels"][0]
+    except (KeyError, IndexError, TypeError):
+        return ""
+    return str(parcel.get("parcelNumber") or parcel.get("ParcelNumber") or "").strip()
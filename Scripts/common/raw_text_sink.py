@@ -0,0 +1,118 @@
+import os
+
+
+# ------------------------------
+# Buffered raw-text writer
+# ------------------------------
+class RawTextSink:
+    """
+    Keeps one append handle open and writes each record in a single os.write,
+    so concurrent writers never interleave partial records. With rotate_every
+    set, a new numbered file is started every N records.
+    """
+
+    def __init__(self, path, rotate_every=None):
+        self.path = path
+        self.rotate_every = rotate_every
+        self.file_index = 0
+        self.records_in_file = 0
+        self.records_written = 0
+        self._fd = None
+        self._fd_path = None
+        self._buffer = []
+
+    # ------------------------------
+    # Record building
+    # ------------------------------
+    def add(self, block):
+        """Buffer one block of the current record (same framing as the old log_to_file)."""
+        self._buffer.append(block + "\n")
+
+    def end_record(self):
+        """Append the buffered record in one write; returns (file, start_offset, end_offset)."""
+        data = "".join(self._buffer).encode("utf-8")
+        self._buffer = []
+
+        if self.rotate_every and self.records_in_file >= self.rotate_every:
+            self._close_fd()
+            self.file_index += 1
+            self.records_in_file = 0
+
+        fd = self._open()
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        end = os.lseek(fd, 0, os.SEEK_CUR)
+
+        self.records_in_file += 1
+        self.records_written += 1
+        return self._fd_path, end - len(data), end
+
+    def write_record(self, blocks):
+        for block in blocks:
+            self.add(block)
+        return self.end_record()
+
+    def flush(self):
+        """Force written records to disk (before they are checkpointed)."""
+        if self._fd is not None:
+            os.fsync(self._fd)
+
+    def rewind(self, records_written, file_path, offset):
+        """
+        Resume after a crash: cut file_path back to offset, dropping any half-written
+        block, remove rotated files started after it, and continue the numbering
+        as if records_written records had been written by this sink.
+        """
+        self._close_fd()
+        self._buffer = []
+        if os.path.exists(file_path) and os.path.getsize(file_path) > offset:
+            os.truncate(file_path, offset)
+
+        self.records_written = records_written
+        if self.rotate_every and records_written:
+            self.file_index, in_file = divmod(records_written - 1, self.rotate_every)
+            self.records_in_file = in_file + 1
+        else:
+            self.file_index = 0
+            self.records_in_file = 0
+
+        if self.rotate_every:
+            later = self.file_index + 1
+            while os.path.exists(self._numbered_path(later)):
+                os.remove(self._numbered_path(later))
+                later += 1
+
+    # ------------------------------
+    # File handling
+    # ------------------------------
+    def current_path(self):
+        if not self.rotate_every:
+            return self.path
+        return self._numbered_path(self.file_index)
+
+    def _numbered_path(self, file_index):
+        root, ext = os.path.splitext(self.path)
+        return f"{root}.{file_index:04d}{ext}"
+
+    def close(self):
+        self._close_fd()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _open(self):
+        if self._fd is None:
+            self._fd_path = self.current_path()
+            flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT | getattr(os, "O_BINARY", 0)
+            self._fd = os.open(self._fd_path, flags, 0o644)
+        return self._fd
+
+    def _close_fd(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
@@ -0,0 +1,185 @@
+import json
+import re
+import threading
+import time
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException, TimeoutException
+
+
+# ------------------------------
+# How long each section really took to settle
+# ------------------------------
+class ReadinessTimings:
+    """Per-section wait samples, used to tune the timeouts from real runs."""
+
+    def __init__(self):
+        self._samples = []
+        self._lock = threading.Lock()
+
+    def record(self, section, seconds, timed_out=False):
+        with self._lock:
+            self._samples.append({"section": section, "seconds": round(seconds, 3), "timed_out": timed_out})
+
+    def drain(self):
+        """Return and forget the samples collected so far (workers ship them to the parent)."""
+        with self._lock:
+            samples, self._samples = self._samples, []
+        return samples
+
+    def extend(self, samples):
+        with self._lock:
+            self._samples.extend(samples)
+
+    def summary(self):
+        with self._lock:
+            samples = list(self._samples)
+
+        by_section = {}
+        for sample in samples:
+            by_section.setdefault(sample["section"], []).append(sample)
+
+        summary = {}
+        for section, items in by_section.items():
+            seconds = sorted(item["seconds"] for item in items)
+            summary[section] = {
+                "count": len(seconds),
+                "avg": round(sum(seconds) / len(seconds), 3),
+                "p95": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))],
+                "max": seconds[-1],
+                "timeouts": sum(1 for item in items if item["timed_out"]),
+            }
+        return summary
+
+    def dump(self, path):
+        """Append the samples as JSON lines."""
+        with self._lock:
+            samples = list(self._samples)
+        with open(path, "a", encoding="utf-8") as f:
+            for sample in samples:
+                f.write(json.dumps(sample) + "\n")
+
+
+readiness_timings = ReadinessTimings()
+
+
+# ------------------------------
+# Wait conditions
+# ------------------------------
+# A section can be genuinely empty (no payments yet). Text that is still empty
+# after this many seconds unchanged counts as settled instead of waiting out the timeout.
+EMPTY_TEXT_GRACE = 2.0
+
+
+class text_is_stable:
+    """
+    Element exists and its text is unchanged across two polls. Empty text must
+    stay unchanged for empty_grace seconds, since the section may still be loading.
+    """
+
+    def __init__(self, locator, empty_grace=EMPTY_TEXT_GRACE):
+        self.locator = locator
+        self.empty_grace = empty_grace
+        self.last_text = None
+        self.since = None
+
+    def __call__(self, driver):
+        try:
+            element = driver.find_element(*self.locator)
+            text = element.text.strip()
+        except (NoSuchElementException, StaleElementReferenceException):
+            self.last_text = None
+            return False
+
+        now = time.monotonic()
+        if text != self.last_text:
+            self.last_text, self.since = text, now
+            return False
+        if text or now - self.since >= self.empty_grace:
+            return element
+        return False
+
+
+# null for a section that is not on the page, so it is not mistaken for an empty one
+SECTIONS_TEXT_SCRIPT = """
+return arguments[0].map(function (id) {
+    var element = document.getElementById(id);
+    return element ? element.innerText : null;
+});
+"""
+
+INNER_TEXT_SPACES_RE = re.compile(r"[ \t]+")
+
+
+def normalize_inner_text(text):
+    """
+    innerText as WebElement.text reads it: table cells (tab-separated in innerText)
+    joined by one space, lines trimmed, no blank lines. Non-breaking spaces become
+    plain spaces after trimming, so &nbsp; indentation survives as it does in .text.
+    """
+    lines = (INNER_TEXT_SPACES_RE.sub(" ", line).strip(" ") for line in (text or "").splitlines())
+    return "\n".join(line.replace("\u00a0", " ") for line in lines if line)
+
+
+class sections_are_stable:
+    """
+    Every section is on the page and its text unchanged across two polls, with the
+    same empty_grace as text_is_stable for empty ones. Each poll is a single script
+    call that reads all sections, so the texts come with the wait.
+    """
+
+    def __init__(self, section_ids, empty_grace=EMPTY_TEXT_GRACE):
+        self.section_ids = list(section_ids)
+        self.empty_grace = empty_grace
+        self.last_texts = None
+        self.since = None
+
+    def __call__(self, driver):
+        texts = driver.execute_script(SECTIONS_TEXT_SCRIPT, self.section_ids)
+        now = time.monotonic()
+        if texts != self.last_texts:
+            self.last_texts, self.since = texts, now
+            return False
+        if any(text is None for text in texts):
+            return False
+        return all(text.strip() for text in texts) or now - self.since >= self.empty_grace
+
+
+# ------------------------------
+# Readiness helpers
+# ------------------------------
+def wait_for_stable_text(driver, locator, section, timeout=30, poll=0.25, timings=None, empty_grace=EMPTY_TEXT_GRACE):
+    """Wait for a section's text to settle; returns the settled text, maybe '' (raises TimeoutException)."""
+    timings = timings or readiness_timings
+    condition = text_is_stable(locator, empty_grace)
+    started = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+    except Exception:
+        timings.record(section, time.perf_counter() - started, timed_out=True)
+        raise
+    timings.record(section, time.perf_counter() - started)
+    return condition.last_text
+
+
+
+def read_stable_sections(driver, section_ids, timeout=30, poll=0.25, timings=None, empty_grace=EMPTY_TEXT_GRACE):
+    """
+    Wait once for all sections to settle and return {id: text} from the last poll.
+    A settled empty section comes back as ''; one that never appeared comes back
+    as None, and the wait is then recorded as timed out instead of raising.
+    """
+    timings = timings or readiness_timings
+    condition = sections_are_stable(section_ids, empty_grace)
+    started = time.perf_counter()
+    timed_out = False
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=poll).until(condition)
+    except TimeoutException:
+        timed_out = True
+    timings.record("sections", time.perf_counter() - started, timed_out=timed_out)
+    texts = condition.last_texts or [None] * len(condition.section_ids)
+    return {
+        section_id: None if text is None else normalize_inner_text(text)
+        for section_id, text in zip(condition.section_ids, texts)
+    }
@@ -0,0 +1,136 @@
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+
+# ------------------------------
+# Bounded pool of warm WebDriver sessions
+# ------------------------------
+class DriverPool:
+    """Lend warm browser sessions to scrape calls instead of starting Chrome per record."""
+
+    def __init__(self, factory, size=2, max_uses=50, reset_url="about:blank"):
+        self.factory = factory
+        self.size = size
+        self.max_uses = max_uses
+        self.reset_url = reset_url
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._uses = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "spawned": 0,
+            "recycled": 0,
+            "crashed": 0,
+            "spawn_seconds": 0.0,
+        }
+
+    # ------------------------------
+    # Borrow / return
+    # ------------------------------
+    def acquire(self, timeout=None):
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError(f"No browser session free after {timeout}s")
+        try:
+            driver = self._idle.get_nowait()
+            self._count("hits")
+            return driver
+        except queue.Empty:
+            pass
+
+        try:
+            return self._spawn()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, driver, broken=False):
+        try:
+            with self._lock:
+                self._uses[id(driver)] = self._uses.get(id(driver), 0) + 1
+                uses = self._uses[id(driver)]
+
+            if broken:
+                self._count("crashed")
+                self._discard(driver)
+            elif uses >= self.max_uses:
+                self._count("recycled")
+                self._discard(driver)
+            elif not self._reset(driver):
+                self._count("crashed")
+                self._discard(driver)
+            else:
+                self._idle.put(driver)
+        finally:
+            self._slots.release()
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        broken = False
+        try:
+            yield driver
+        except Exception:
+            broken = True
+            raise
+        finally:
+            self.release(driver, broken=broken)
+
+    # ------------------------------
+    # Counters and shutdown
+    # ------------------------------
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["idle"] = self._idle.qsize()
+        stats["avg_spawn_seconds"] = (
+            round(stats["spawn_seconds"] / stats["spawned"], 3) if stats["spawned"] else 0.0
+        )
+        return stats
+
+    def close(self):
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(driver)
+
+    # ------------------------------
+    # Internal helpers
+    # ------------------------------
+    def _spawn(self):
+        started = time.perf_counter()
+        driver = self.factory()
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats["misses"] += 1
+            self._stats["spawned"] += 1
+            self._stats["spawn_seconds"] += elapsed
+            self._uses[id(driver)] = 0
+        return driver
+
+    def _reset(self, driver):
+        """Clear cookies and park the session on a blank page; False means the session is dead."""
+        try:
+            driver.delete_all_cookies()
+            driver.get(self.reset_url)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, driver):
+        with self._lock:
+            self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _count(self, key):
+        with self._lock:
+            self._stats[key] += 1
@@ -0,0 +1,98 @@
+import re
+
+from common.money import np, parse_amounts
+
+
+AMOUNT_COLUMNS = ("spring", "fall", "delinquencies", "total", "payments")
+COLUMNS = ("record", "row", "year") + AMOUNT_COLUMNS
+
+# One Tax History row in either layout: '2024 $x $y $z ...' on one line, or the
+# year alone on a line with the amounts on the next ('\s+' spans the newline).
+# At least three amounts are required; total and payments may be missing.
+# Amounts are the same tokens common.money parses, with or without cents.
+_AMOUNT = r"\$-?\d+(?:,\d{3})*(?:\.\d{1,2})?"
+TAX_HISTORY_ROW_RE = re.compile(
+    rf"^[ \t]*(\d{{4}})\s+{_AMOUNT}[ \t]+{_AMOUNT}[ \t]+{_AMOUNT}(?:[ \t]+{_AMOUNT})?(?:[ \t]+{_AMOUNT})?",
+    re.MULTILINE,
+)
+
+# Below this many rows the numpy conversion costs more than it saves
+VECTORIZE_MIN_ROWS = 256
+
+
+# ------------------------------
+# Tax History rows, either layout
+# ------------------------------
+def iter_tax_history_rows(tax_history_block):
+    """
+    Yield (year, [spring, fall, delinquencies, total, payments]) in cents from the
+    Tax History block, in one regex pass. Missing trailing amounts count as zero.
+    """
+    for match in TAX_HISTORY_ROW_RE.finditer(tax_history_block):
+        amounts = parse_amounts(match.group(0))
+        yield int(match.group(1)), amounts + [0] * (len(AMOUNT_COLUMNS) - len(amounts))
+
+
+# ------------------------------
+# Columnar table for one record or a whole batch
+# ------------------------------
+class TaxHistoryTable:
+    """
+    Tax History rows stored column by column. 'row' is the position inside the
+    record, so row 0 is the current pay year and later rows are prior years.
+    Filled with a whole chunk of records, the selections below run as one
+    vectorized pass over every row when numpy is available.
+    """
+
+    def __init__(self):
+        self.columns = {name: [] for name in COLUMNS}
+        self._arrays = None
+
+    def add_record(self, record_id, tax_history_block):
+        columns = self.columns
+        self._arrays = None
+        for row, (year, amounts) in enumerate(iter_tax_history_rows(tax_history_block)):
+            columns["record"].append(record_id)
+            columns["row"].append(row)
+            columns["year"].append(year)
+            for name, cents in zip(AMOUNT_COLUMNS, amounts):
+                columns[name].append(cents)
+        return self
+
+    def __len__(self):
+        return len(self.columns["record"])
+
+    def as_arrays(self):
+        """int64 arrays of the numeric columns; record ids stay in their list."""
+        if np is None:
+            raise ImportError("numpy is required for as_arrays(); pip install numpy")
+        if self._arrays is None:
+            self._arrays = {name: np.asarray(self.columns[name], dtype=np.int64) for name in COLUMNS[1:]}
+        return self._arrays
+
+    def _select(self, predicate_np, predicate_py):
+        """Indexes of the rows matching the predicate, vectorized when numpy is available."""
+        if np is not None and len(self) >= VECTORIZE_MIN_ROWS:
+            return np.flatnonzero(predicate_np(self.as_arrays())).tolist()
+        return [i for i in range(len(self)) if predicate_py(i)]
+
+    def current_rows(self):
+        """{record_id: (spring, fall, delinquencies, total, payments)} for each record's first row."""
+        columns = self.columns
+        indexes = self._select(lambda a: a["row"] == 0, lambda i: columns["row"][i] == 0)
+        return {
+            columns["record"][i]: tuple(columns[name][i] for name in AMOUNT_COLUMNS)
+            for i in indexes
+        }
+
+    def delinquencies(self):
+        """{record_id: [(year, cents), ...]} for prior years with an outstanding delinquency."""
+        columns = self.columns
+        indexes = self._select(
+            lambda a: (a["row"] > 0) & (a["delinquencies"] > 0),
+            lambda i: columns["row"][i] > 0 and columns["delinquencies"][i] > 0,
+        )
+        result = {}
+        for i in indexes:
+            result.setdefault(columns["record"][i], []).append((columns["year"][i], columns["delinquencies"][i]))
+        return result
@@ -0,0 +1,222 @@
+import json
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# ------------------------------
+# Per-record, per-step trace of the scrape flow
+# ------------------------------
+class StepTracer:
+    """
+    One span per record and step: wall time, time spent in explicit waits
+    (WebDriverWait), WebDriver commands sent and the outcome. Spans are kept
+    per thread, so concurrent records in one process do not mix. Tags (e.g. the
+    browser profile) are copied into every span so runs can be compared.
+    """
+
+    def __init__(self):
+        self.tags = {}
+        self._spans = []
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    # ------------------------------
+    # Recording
+    # ------------------------------
+    @contextmanager
+    def record(self, record_id):
+        """Every step inside this block is attributed to record_id."""
+        previous = getattr(self._local, "record_id", None)
+        self._local.record_id = record_id
+        try:
+            yield
+        finally:
+            self._local.record_id = previous
+
+    @contextmanager
+    def step(self, name, driver=None):
+        """
+        Time one step. Exceptions mark the span 'error' and propagate; code that
+        handles its own errors can call fail(span, e) or set span['outcome'].
+        """
+        if driver is not None:
+            instrument_driver(driver)
+        span = {
+            "record": getattr(self._local, "record_id", None),
+            "step": name,
+            "started_at": round(time.time(), 3),
+            "wall": 0.0,
+            "wait": 0.0,
+            "commands": 0,
+            "outcome": "ok",
+        }
+        span.update(self.tags)
+        stack = self._stack()
+        stack.append(span)
+        started = time.perf_counter()
+        try:
+            with timed_waits(self):
+                yield span
+        except Exception as e:
+            fail(span, e)
+            raise
+        finally:
+            span["wall"] = round(time.perf_counter() - started, 4)
+            span["wait"] = round(span["wait"], 4)
+            stack.pop()
+            with self._lock:
+                self._spans.append(span)
+
+    def current(self):
+        """Innermost open span on this thread, or None."""
+        stack = self._stack()
+        return stack[-1] if stack else None
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    # ------------------------------
+    # Collecting across workers
+    # ------------------------------
+    def drain(self):
+        """Return and forget the spans collected so far (workers ship them to the parent)."""
+        with self._lock:
+            spans, self._spans = self._spans, []
+        return spans
+
+    def extend(self, spans):
+        with self._lock:
+            self._spans.extend(spans)
+
+    def dump(self, path):
+        """Append the spans as JSON lines."""
+        with self._lock:
+            spans = list(self._spans)
+        with open(path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(span) + "\n")
+
+    def summary(self):
+        with self._lock:
+            spans = list(self._spans)
+
+        by_step = {}
+        for span in spans:
+            by_step.setdefault(span["step"], []).append(span)
+
+        summary = {}
+        for step, items in by_step.items():
+            wall = sorted(item["wall"] for item in items)
+            outcomes = {}
+            for item in items:
+                outcomes[item["outcome"]] = outcomes.get(item["outcome"], 0) + 1
+            summary[step] = {
+                "count": len(wall),
+                "p50": percentile(wall, 0.50),
+                "p95": percentile(wall, 0.95),
+                "p99": percentile(wall, 0.99),
+                "avg_wait": round(sum(item["wait"] for item in items) / len(items), 4),
+                "avg_commands": round(sum(item["commands"] for item in items) / len(items), 1),
+                "outcomes": outcomes,
+            }
+            weighed = [item["bytes"] for item in items if "bytes" in item]
+            if weighed:
+                summary[step]["avg_bytes"] = round(sum(weighed) / len(weighed))
+        return summary
+
+    def print_summary(self):
+        tags = " ".join(f"{key}={value}" for key, value in self.tags.items())
+        print(f"\nStep timings (seconds){' ' + tags if tags else ''}:")
+        for step, stats in self.summary().items():
+            weight = f" bytes={stats['avg_bytes']}" if "avg_bytes" in stats else ""
+            print(
+                f"  {step:<12} n={stats['count']:<5} p50={stats['p50']:<8} p95={stats['p95']:<8} "
+                f"p99={stats['p99']:<8} wait={stats['avg_wait']:<8} cmds={stats['avg_commands']:<6}{weight} {stats['outcomes']}"
+            )
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def fail(span, error, outcome="error"):
+    span["outcome"] = outcome
+    span["error"] = f"{type(error).__name__}: {error}"
+
+
+step_tracer = StepTracer()
+
+
+# ------------------------------
+# WebDriver hooks
+# ------------------------------
+def instrument_driver(driver, tracer=None):
+    """Count every WebDriver command against the current span (once per driver)."""
+    if getattr(driver, "_step_tracer_instrumented", False):
+        return driver
+    tracer = tracer or step_tracer
+    execute = driver.execute
+
+    def counted_execute(*args, **kwargs):
+        span = tracer.current()
+        if span is not None:
+            span["commands"] += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counted_execute
+    driver._step_tracer_instrumented = True
+    return driver
+
+
+# Tracers with a step open (one entry per open step) and the methods they replaced
+_wait_lock = threading.Lock()
+_wait_tracers = []
+_original_waits = {}
+
+
+@contextmanager
+def timed_waits(tracer):
+    """
+    While the block runs, time spent polling in explicit waits (WebDriverWait.until /
+    until_not) counts as the wait time of tracer's current span. The hooks are put back
+    once no step is open, so importing this module leaves WebDriverWait untouched.
+    """
+    with _wait_lock:
+        if not _wait_tracers:
+            for name in ("until", "until_not"):
+                method = getattr(WebDriverWait, name, None)
+                if method is not None:
+                    _original_waits[name] = method
+                    setattr(WebDriverWait, name, _timed_wait(method))
+        _wait_tracers.append(tracer)
+    try:
+        yield
+    finally:
+        with _wait_lock:
+            _wait_tracers.remove(tracer)
+            if not _wait_tracers:
+                for name, method in _original_waits.items():
+                    setattr(WebDriverWait, name, method)
+                _original_waits.clear()
+
+
+def _timed_wait(method):
+    def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            for tracer in dict.fromkeys(list(_wait_tracers)):
+                span = tracer.current()
+                if span is not None:
+                    span["wait"] += elapsed
+                    break
+    return wrapper
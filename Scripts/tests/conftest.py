@@ -0,0 +1,24 @@
+import os
+import sys
+
+import pytest
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+for folder in ("", "Output_Script", "Dataset_Script", "Benchmark_Script"):
+    path = os.path.abspath(os.path.join(SCRIPTS_DIR, folder))
+    if path not in sys.path:
+        sys.path.append(path)
+
+# The eight records scraped from the live site
+SAMPLE_RAW_TEXT = os.path.abspath(os.path.join(SCRIPTS_DIR, "..", "Final_Result", "Raw_Text_Result.txt"))
+
+
+@pytest.fixture
+def sample_raw_text():
+    return SAMPLE_RAW_TEXT
+
+
+@pytest.fixture
+def stub_parcels():
+    from lowtaxinfo_stub import load_parcels
+    return load_parcels(SAMPLE_RAW_TEXT)
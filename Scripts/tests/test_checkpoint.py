@@ -0,0 +1,110 @@
+import os
+
+from common.checkpoint import CheckpointJournal, record_key, resume_sink
+from common.raw_text_sink import RawTextSink
+
+
+def read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def write_records(sink, journal, records):
+    for idx, blocks in records:
+        location = sink.write_record(blocks)
+        sink.flush()
+        journal.record(record_key(idx, f"{idx} Main St", "Owner"), location)
+
+
+# ------------------------------
+# Resume after a crash
+# ------------------------------
+def test_resume_cuts_back_to_the_last_checkpoint(tmp_path):
+    output = str(tmp_path / "raw.txt")
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("banner\n")
+
+    sink, journal = RawTextSink(output), CheckpointJournal(output + ".journal")
+    journal.start(sink.current_path())
+    write_records(sink, journal, [(1, ["record one"]), (2, ["record two"])])
+    # Crash: half a record in the output and half a journal line
+    sink.add("record thr")
+    sink.end_record()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"key": "3|')
+    sink.close()
+    journal.close()
+
+    sink, journal = RawTextSink(output), CheckpointJournal(output + ".journal").load()
+    resume_sink(journal, sink)
+    assert journal.done_keys() == {"1|1 Main St|Owner", "2|2 Main St|Owner"}
+    assert read(journal.path).endswith("}\n")
+    assert read(output) == "banner\nrecord one\nrecord two\n"
+
+    write_records(sink, journal, [(3, ["record three"])])
+    sink.close()
+    journal.close()
+    assert read(output) == "banner\nrecord one\nrecord two\nrecord three\n"
+    assert len(CheckpointJournal(journal.path).load().entries) == 3
+
+
+def test_resume_before_any_record_keeps_earlier_output(tmp_path):
+    output = str(tmp_path / "raw.txt")
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("earlier run\n")
+
+    sink, journal = RawTextSink(output), CheckpointJournal(output + ".journal")
+    journal.start(sink.current_path())
+    sink.add("torn")
+    sink.end_record()
+    sink.close()
+
+    sink, journal = RawTextSink(output), CheckpointJournal(output + ".journal").load()
+    resume_sink(journal, sink)
+    assert journal.done_keys() == set()
+    assert read(output) == "earlier run\n"
+
+
+def test_resume_with_rotation_drops_later_files(tmp_path):
+    output = str(tmp_path / "raw.txt")
+    sink, journal = RawTextSink(output, rotate_every=2), CheckpointJournal(output + ".journal")
+    journal.start(sink.current_path())
+    write_records(sink, journal, [(n, [f"record {n}"]) for n in range(1, 4)])
+    sink.write_record(["record 4, not journaled"])
+    sink.write_record(["record 5, not journaled"])
+    sink.close()
+    journal.close()
+    assert os.path.exists(str(tmp_path / "raw.0002.txt"))
+
+    sink, journal = RawTextSink(output, rotate_every=2), CheckpointJournal(output + ".journal").load()
+    resume_sink(journal, sink)
+    assert not os.path.exists(str(tmp_path / "raw.0002.txt"))
+    assert read(str(tmp_path / "raw.0001.txt")) == "record 3\n"
+
+    write_records(sink, journal, [(4, ["record 4"]), (5, ["record 5"])])
+    sink.close()
+    journal.close()
+    assert read(str(tmp_path / "raw.0000.txt")) == "record 1\nrecord 2\n"
+    assert read(str(tmp_path / "raw.0001.txt")) == "record 3\nrecord 4\n"
+    assert read(str(tmp_path / "raw.0002.txt")) == "record 5\n"
+
+
+def test_resume_without_a_journal_starts_one(tmp_path):
+    output = str(tmp_path / "raw.txt")
+    with open(output, "w", encoding="utf-8") as f:
+        f.write("earlier run\n")
+
+    # --resume on a run that never journaled anything
+    sink, journal = RawTextSink(output), CheckpointJournal(output + ".journal").load()
+    resume_sink(journal, sink)
+    assert journal.begin == {"file": output, "offset": len("earlier run\n")}
+
+    # ... and it crashes halfway through its first record
+    sink.add("torn")
+    sink.end_record()
+    sink.close()
+
+    sink, journal = RawTextSink(output), CheckpointJournal(output + ".journal").load()
+    resume_sink(journal, sink)
+    assert journal.done_keys() == set()
+    assert read(output) == "earlier run\n"
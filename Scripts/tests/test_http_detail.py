@@ -0,0 +1,70 @@
+import pytest
+
+from common.http_detail import DETAIL_SECTIONS, fetch_detail_sections, parse_detail_sections, section_blocks
+from lowtaxinfo_stub import detail_page, start_stub_server
+
+
+def expected_sections(parcel):
+    return {section_id: parcel["sections"][title] for section_id, title in DETAIL_SECTIONS}
+
+
+# ------------------------------
+# Parsing the detail page HTML
+# ------------------------------
+def test_stub_detail_pages_round_trip(stub_parcels):
+    assert len(stub_parcels) == 8
+    for parcel in stub_parcels:
+        assert parse_detail_sections(detail_page(parcel)) == expected_sections(parcel)
+
+
+def test_indentation_survives_as_plain_spaces(stub_parcels):
+    sections = parse_detail_sections(detail_page(stub_parcels[0]))
+    assert "\n    Receipts: $" in sections["billing-detail"]
+
+
+def test_section_blocks_match_the_selenium_layout(stub_parcels):
+    parcel = stub_parcels[0]
+    blocks = section_blocks(parse_detail_sections(detail_page(parcel)))
+    assert blocks[0] == "\nProperty Information:\n" + parcel["sections"]["Property Information"]
+    assert [block.split("\n")[1] for block in blocks] == [f"{title}:" for _, title in DETAIL_SECTIONS]
+
+
+def test_js_rendered_page_falls_back():
+    shell = '<html><body><div id="parcel">' + "".join(
+        f'<div id="{section_id}"></div>' for section_id, _ in DETAIL_SECTIONS
+    ) + "</div></body></html>"
+    assert parse_detail_sections(shell) is None
+    assert parse_detail_sections("<html><body>Not found</body></html>") is None
+
+
+def test_hidden_text_and_cells_read_like_webdriver():
+    page = "".join(
+        f'<div id="{section_id}"><div>{section_id}</div></div>' for section_id, _ in DETAIL_SECTIONS[1:]
+    )
+    page += (
+        '<div id="info"><script>var x = 1;</script><div style="display: none">hidden</div>'
+        "<table><tr><td>Parcel</td><td>02-01</td></tr></table></div>"
+    )
+    assert parse_detail_sections(page)["info"] == "Parcel 02-01"
+
+
+# ------------------------------
+# Fetching from the running stub
+# ------------------------------
+@pytest.fixture
+def stub_server(sample_raw_text):
+    server, config, base_url = start_stub_server(raw_text_path=sample_raw_text)
+    yield config, base_url
+    server.shutdown()
+
+
+def test_fetch_detail_sections_from_stub(stub_server):
+    config, base_url = stub_server
+    parcel = config.parcels[1]
+    sections = fetch_detail_sections(f"{base_url}/allencounty/{parcel['duplicate']}-2025")
+    assert sections == expected_sections(parcel)
+
+
+def test_fetch_missing_parcel_returns_none(stub_server):
+    _, base_url = stub_server
+    assert fetch_detail_sections(f"{base_url}/allencounty/1-2025") is None
@@ -0,0 +1,99 @@
+import json
+
+from common.manifest import Manifest, content_hash, manifest_path, merge_jsonl
+
+
+def key_of(row):
+    return row["id"]
+
+
+def line(key, value):
+    return json.dumps({"id": key, "value": value})
+
+
+def read_rows(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(row) for row in f if row.strip()]
+
+
+# ------------------------------
+# merge_jsonl
+# ------------------------------
+def test_merge_replaces_in_place_and_appends_new_keys(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(line(key, "old") for key in ("a", "b", "c")) + "\n")
+
+    replaced, appended = merge_jsonl(path, {"d": line("d", "new"), "b": line("b", "new")}, key_of)
+    assert (replaced, appended) == (1, 1)
+    assert [(row["id"], row["value"]) for row in read_rows(path)] == [
+        ("a", "old"), ("b", "new"), ("c", "old"), ("d", "new"),
+    ]
+
+
+def test_merge_creates_the_file(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    assert merge_jsonl(path, {"a": line("a", 1)}, key_of) == (0, 1)
+    assert read_rows(path) == [{"id": "a", "value": 1}]
+
+
+def test_merge_without_updates_leaves_the_file_alone(tmp_path):
+    path = str(tmp_path / "out.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(line("a", 1))  # no trailing newline
+    assert merge_jsonl(path, {}, key_of) == (0, 0)
+    with open(path, "r", encoding="utf-8") as f:
+        assert f.read() == line("a", 1)
+
+
+# ------------------------------
+# Manifest
+# ------------------------------
+def test_manifest_round_trip(tmp_path):
+    target = str(tmp_path / "out.jsonl")
+    open(target, "w").close()
+    manifest = Manifest(manifest_path(target), target_path=target)
+    manifest.update("a", content_hash("1", "record a"))
+    manifest.save()
+
+    reloaded = Manifest(manifest_path(target), target_path=target)
+    assert reloaded.unchanged("a", content_hash("1", "record a"))
+    assert not reloaded.unchanged("a", content_hash("2", "record a"))
+    assert not reloaded.unchanged("b", content_hash("1", "record b"))
+
+
+def test_manifest_is_ignored_once_its_target_is_gone(tmp_path):
+    target = str(tmp_path / "out.jsonl")
+    manifest = Manifest(manifest_path(target))
+    manifest.update("a", "digest")
+    manifest.save()
+    assert Manifest(manifest_path(target), target_path=target).entries == {}
+
+
+def test_content_hash_keeps_parts_apart():
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+    assert content_hash("1", "record") == content_hash("1", "record")
+
+
+# ------------------------------
+# Incremental Output run
+# ------------------------------
+def test_process_changed_records_merges_only_changes(tmp_path, sample_raw_text, monkeypatch):
+    import Allen_Output as output
+
+    monkeypatch.setattr(output, "input_file", sample_raw_text)
+    path = str(tmp_path / "out.jsonl")
+    output.process_changed_records(output_file=path)
+    first = read_rows(path)
+    assert len(first) == 8
+
+    manifest = Manifest(manifest_path(path), target_path=path)
+    assert len(manifest.entries) == 8
+
+    # Unchanged input: nothing is re-parsed; a parser bump re-parses everything
+    output.process_changed_records(output_file=path)
+    assert Manifest(manifest_path(path), target_path=path).entries == manifest.entries
+    monkeypatch.setattr(output, "PARSER_VERSION", output.PARSER_VERSION + ".test")
+    output.process_changed_records(output_file=path)
+    assert Manifest(manifest_path(path), target_path=path).entries != manifest.entries
+    assert read_rows(path) == first
@@ -0,0 +1,58 @@
+import pytest
+
+from common.money import format_cents, parse_amounts, parse_cents, split_installments
+
+
+# ------------------------------
+# Parsing and formatting
+# ------------------------------
+@pytest.mark.parametrize("token, cents", [
+    ("$1,234.56", 123456), ("$0.00", 0), ("$1,200", 120000), ("$12.5", 1250), ("$-3.07", -307), (" $5 ", 500),
+])
+def test_parse_cents(token, cents):
+    assert parse_cents(token) == cents
+
+
+@pytest.mark.parametrize("token", ["1,234.56", "$1,23.45", "$", "$1.234"])
+def test_parse_cents_rejects_non_amounts(token):
+    with pytest.raises(ValueError):
+        parse_cents(token)
+
+
+def test_parse_amounts_in_order():
+    assert parse_amounts("Spring Tax: $1,267.36 $0.00 $1,267 (was $12.5)") == [126736, 0, 126700, 1250]
+
+
+def test_format_cents():
+    assert [format_cents(c) for c in (0, 5, 123456, 100000000, -307)] == [
+        "$0.00", "$0.05", "$1,234.56", "$1,000,000.00", "$-3.07",
+    ]
+
+
+# ------------------------------
+# Installments
+# ------------------------------
+def test_split_installments_odd_cent_goes_first():
+    assert split_installments(390590) == (195295, 195295)
+    assert split_installments(597415) == (298708, 298707)
+    assert split_installments(839845) == (419923, 419922)
+
+
+@pytest.mark.parametrize("total", [0, 1, 2, 3, 597415, 839845, 123456789, -1, -597415])
+def test_split_installments_add_up_to_the_total(total):
+    first, second = split_installments(total)
+    assert first + second == total
+    assert abs(first - second) <= 1
+
+
+# ------------------------------
+# Batch helpers
+# ------------------------------
+def test_amounts_array():
+    np = pytest.importorskip("numpy")
+    from common.money import amounts_array
+
+    array = amounts_array("2024 $1,200 $1,200.50 $0.00 $2,400.50")
+    assert array.dtype == np.int64
+    assert array.tolist() == [120000, 120050, 0, 240050]
+    assert int(array.sum()) == 480100
@@ -0,0 +1,150 @@
+import pytest
+
+import Allen_Output as output
+from common.raw_records import iter_raw_records
+import common.tax_history as tax_history
+from common.tax_history import TaxHistoryTable, iter_tax_history_rows
+
+# One record in the Raw Text layout: two-line current row, one prior delinquency
+RAW_RECORD = """Property Information:
+Property Information
+Tax Year/Pay Year
+2024 / 2025
+Parcel Number
+02-01-05-200-001.000-044
+Duplicate Number
+100001
+
+Tax Information:
+Tax and Penalty: $5,974.15
+    Receipts: $2,987
+Total Due: $2,987.15
+
+Payment History:
+Payable Year Entry Date Payable Period Amount Paid Notes Property Project
+2025 05/01/2025 S $2,987.00 Lock Box Payment N
+
+Tax History:
+Pay Year Spring Fall Delinquencies Total Tax Payments
+2025
+$2,987 $2,987.15 $0.00 $5,974.15 $2,987.00
+2024 $2,500.00 $2,500.00 $1,204.9 $6,204.90 $5,000.00
+2023 $2,400.00 $2,400.00 $0.00 $4,800.00
+
+Due Dates:
+May 12, 2025
+November 10, 2025
+"""
+
+
+# ------------------------------
+# Tax History
+# ------------------------------
+def test_tax_history_rows_in_both_layouts():
+    block = output.section_text(RAW_RECORD, output.tokenize_sections(RAW_RECORD), "Tax History")
+    assert list(iter_tax_history_rows(block)) == [
+        (2025, [298700, 298715, 0, 597415, 298700]),
+        (2024, [250000, 250000, 120490, 620490, 500000]),
+        (2023, [240000, 240000, 0, 480000, 0]),
+    ]
+
+
+def test_tax_history_table_current_rows_and_delinquencies():
+    table = TaxHistoryTable()
+    table.add_record("a", "2025\n$10.00 $10.00 $0.00 $20.00 $20.00\n2024 $9.00 $9.00 $1.50 $19.50 $18.00")
+    table.add_record("b", "2025 $5.00 $5.00 $0.00 $10.00 $0.00\n2024 $4.00 $4.00 $0.00 $8.00 $8.00")
+    assert len(table) == 4
+    assert table.current_rows() == {"a": (1000, 1000, 0, 2000, 2000), "b": (500, 500, 0, 1000, 0)}
+    assert table.delinquencies() == {"a": [(2024, 150)]}
+
+
+# ------------------------------
+# parse_raw_text
+# ------------------------------
+def test_parse_raw_text_record():
+    parsed = output.parse_raw_text(RAW_RECORD)
+    assert parsed["parcelNumber"] == "02-01-05-200-001.000-044"
+    assert parsed["taxYear"] == "2025"
+    assert parsed["agencies"] == [{
+        "installmentAmount1": "$2,987.08",
+        "installmentDueDate1": "05/12/2025",
+        "installmentDelinquentDate1": "05/13/2025",
+        "installmentPaidAmount1": "$2,987.08",
+        "installmentUnPaidAmount1": "$0.00",
+        "installmentAmount2": "$2,987.07",
+        "installmentDueDate2": "11/10/2025",
+        "installmentDelinquentDate2": "11/11/2025",
+        "installmentPaidAmount2": "$0.00",
+        "installmentUnPaidAmount2": "$2,987.07",
+    }]
+    assert parsed["delinquencies"] == [{"payoffAmount": "$1,204.90", "taxYear": "2024"}]
+
+
+def test_parse_sample_records(sample_raw_text):
+    parsed = [output.parse_raw_text(record) for record in iter_raw_records(sample_raw_text)]
+    assert len(parsed) == 8
+
+    # Part paid with a delinquency carried in: the installments follow the Spring / Fall columns
+    agency = parsed[1]["agencies"][0]
+    assert (agency["installmentAmount1"], agency["installmentPaidAmount1"], agency["installmentUnPaidAmount1"]) == (
+        "$1,952.95", "$1,267.36", "$685.59",
+    )
+    assert (agency["installmentPaidAmount2"], agency["installmentUnPaidAmount2"]) == ("$1,257.36", "$695.59")
+    assert parsed[1]["delinquencies"] == [{"payoffAmount": "$42.51", "taxYear": "2023"}]
+
+    assert [item["taxYear"] for item in parsed[7]["delinquencies"]] == ["2022", "2021", "2020", "2019", "2017", "2016"]
+    assert parsed[7]["delinquencies"][1] == {"payoffAmount": "$1,204.98", "taxYear": "2021"}
+
+
+# ------------------------------
+# One table per batch
+# ------------------------------
+def sample_table(raw_texts):
+    table = TaxHistoryTable()
+    for record_id, raw_text in enumerate(raw_texts):
+        table.add_record(record_id, output.section_text(raw_text, output.tokenize_sections(raw_text), "Tax History"))
+    return table
+
+
+def test_vectorized_selections_match_the_plain_loop(sample_raw_text, monkeypatch):
+    pytest.importorskip("numpy")
+    table = sample_table(list(iter_raw_records(sample_raw_text)) * 8)
+    assert len(table) >= tax_history.VECTORIZE_MIN_ROWS
+    vectorized = table.current_rows(), table.delinquencies()
+    monkeypatch.setattr(tax_history, "np", None)
+    assert (table.current_rows(), table.delinquencies()) == vectorized
+
+
+def test_batch_rows_match_per_record_rows(sample_raw_text):
+    records = list(iter_raw_records(sample_raw_text)) + [RAW_RECORD, "Property Information:\nno tax history"]
+    rows = output.batch_tax_history_rows(records)
+    assert rows == [output.tax_history_rows(sample_table([record]), 0) for record in records]
+    assert rows[-1] == (output.NO_TAX_HISTORY, [])
+    assert [output.parse_raw_text(record, row) for record, row in zip(records, rows)] == [
+        output.parse_raw_text(record) for record in records
+    ]
+
+
+def test_parse_chunk_keeps_order_and_isolates_errors(sample_raw_text, monkeypatch, tmp_path):
+    records = list(iter_raw_records(sample_raw_text))
+    jobs = list(enumerate(records, 1))
+    jobs.insert(3, (99, RAW_RECORD.replace("02-01-05-200-001.000-044", "BAD")))
+    parse_raw_text = output.parse_raw_text
+
+    def failing_parse(raw_text, tax_rows=None):
+        if "BAD" in raw_text:
+            raise ValueError("bad record")
+        return parse_raw_text(raw_text, tax_rows)
+
+    monkeypatch.setattr(output, "parse_raw_text", failing_parse)
+    for cache_path in (None, str(tmp_path / "cache.sqlite3"), str(tmp_path / "cache.sqlite3")):
+        output.init_parse_cache(cache_path)
+        results = output.parse_chunk(jobs, "jsonl")
+        assert [idx for idx, _, _, _ in results] == [idx for idx, _ in jobs]
+        assert results[3] == (99, None, None, "bad record")
+        good = [result for result in results if result[3] is None]
+        assert [parsed for _, parsed, _, _ in good] == [parse_raw_text(record) for record in records]
+        assert [block for _, _, block, _ in good] == [
+            output.render_output(parse_raw_text(record), "jsonl") for record in records
+        ]
+    output.init_parse_cache(None)